@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""Create all sample databases in parallel.
+
+The e-commerce and time-series databases are written to separate files
+and share no state, so each one is built in its own process with its own
+DuckDB connection.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import create_sample_db
+import create_timeseries_db
+
+
+def main():
+    """Build every sample database concurrently."""
+    builders = [create_sample_db.create_database, create_timeseries_db.create_database]
+
+    with ProcessPoolExecutor(max_workers=len(builders)) as executor:
+        futures = [executor.submit(build) for build in builders]
+        for future in futures:
+            # Re-raise any failure from the worker process
+            future.result()
+
+
+if __name__ == "__main__":
+    main()
@@ -14,16 +14,23 @@ The data includes realistic patterns for the cataloging agent to discover:
 - Data quality issues
 """
 
-import random
-from datetime import datetime, timedelta
+import os
 from pathlib import Path
+from typing import Any
 
 import duckdb
+import numpy as np
+import pyarrow as pa
 
+# Seed for the random generator; set SEED to produce a different dataset
+SEED = int(os.environ.get("SEED", "42"))
 
-def create_database(db_path: str = "data/sample_ecommerce.duckdb"):
+
+def create_database(db_path: str = "data/sample_ecommerce.duckdb", seed: int = SEED):
     """Create and populate a sample e-commerce database."""
 
+    rng = np.random.default_rng(seed)
+
     # Ensure data directory exists
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
@@ -36,25 +43,32 @@ def create_database(db_path: str = "data/sample_ecommerce.duckdb"):
     print(f"Creating database at: {db_path}")
     conn = duckdb.connect(db_path)
 
+    # Bulk load: let DuckDB reorder rows while writing and load everything
+    # in one transaction so there is a single commit instead of one per table
+    conn.execute("SET preserve_insertion_order = false")
+    conn.begin()
+
     # Create tables
     print("Creating tables...")
-    create_users_table(conn)
-    create_products_table(conn)
-    create_orders_table(conn)
-    create_order_items_table(conn)
+    create_tables(conn)
 
     # Populate with sample data
     print("Populating users...")
-    populate_users(conn, num_users=1000)
+    active_user_ids = populate_users(conn, rng, num_users=1000)
 
     print("Populating products...")
-    populate_products(conn, num_products=200)
+    product_ids, prices = populate_products(conn, rng, num_products=200)
 
     print("Populating orders...")
-    populate_orders(conn, num_orders=3000)
+    order_ids = populate_orders(conn, rng, num_orders=3000, user_ids=active_user_ids)
 
     print("Populating order items...")
-    populate_order_items(conn)
+    populate_order_items(conn, rng, order_ids, product_ids, prices)
+
+    conn.commit()
+
+    print("Adding primary keys...")
+    add_primary_keys(conn)
 
     # Print summary
     print("\n" + "=" * 50)
@@ -71,11 +85,32 @@ def create_database(db_path: str = "data/sample_ecommerce.duckdb"):
     conn.close()
 
 
-def create_users_table(conn):
-    """Create users table with realistic schema."""
+def insert_columns(conn, table: str, columns: dict[str, Any]):
+    """Bulk-insert column arrays into a table via a registered Arrow table.
+
+    DuckDB's executemany binds and executes one INSERT per row; handing it
+    a columnar Arrow table instead lets the whole batch go through a single
+    INSERT ... SELECT. Columns must be given in table order. Float columns
+    bound for DECIMAL columns are rounded by DuckDB's cast on insert.
+    """
+    data = pa.table(columns)
+    view = f"_{table}_staging"
+    conn.register(view, data)
+    try:
+        conn.execute(f"INSERT INTO {table} SELECT * FROM {view}")
+    finally:
+        conn.unregister(view)
+
+
+def create_tables(conn):
+    """Create the e-commerce tables in a single multi-statement execute.
+
+    Primary keys are left off here so rows are not checked against an ART
+    index during the bulk load; see add_primary_keys.
+    """
     conn.execute("""
         CREATE TABLE users (
-            user_id INTEGER PRIMARY KEY,
+            user_id INTEGER,
             email VARCHAR,
             first_name VARCHAR,
             last_name VARCHAR,
@@ -87,15 +122,10 @@ def create_users_table(conn):
             is_active BOOLEAN,
             total_orders INTEGER,
             total_spent DECIMAL(10,2)
-        )
-    """)
+        );
 
-
-def create_products_table(conn):
-    """Create products table."""
-    conn.execute("""
         CREATE TABLE products (
-            product_id INTEGER PRIMARY KEY,
+            product_id INTEGER,
             name VARCHAR,
             category VARCHAR,
             subcategory VARCHAR,
@@ -104,15 +134,10 @@ def create_products_table(conn):
             stock_quantity INTEGER,
             supplier VARCHAR,
             created_at TIMESTAMP
-        )
-    """)
+        );
 
-
-def create_orders_table(conn):
-    """Create orders table."""
-    conn.execute("""
         CREATE TABLE orders (
-            order_id INTEGER PRIMARY KEY,
+            order_id INTEGER,
             user_id INTEGER,
             order_date TIMESTAMP,
             status VARCHAR,
@@ -122,26 +147,35 @@ def create_orders_table(conn):
             discount_code VARCHAR,
             shipped_date TIMESTAMP,
             delivered_date TIMESTAMP
-        )
-    """)
+        );
 
-
-def create_order_items_table(conn):
-    """Create order items table."""
-    conn.execute("""
         CREATE TABLE order_items (
-            order_item_id INTEGER PRIMARY KEY,
+            order_item_id INTEGER,
             order_id INTEGER,
             product_id INTEGER,
             quantity INTEGER,
             unit_price DECIMAL(10,2),
             discount DECIMAL(10,2)
-        )
+        );
+    """)
+
+
+def add_primary_keys(conn):
+    """Add primary keys once the tables are loaded, building each index in one pass."""
+    conn.execute("""
+        ALTER TABLE users ADD PRIMARY KEY (user_id);
+        ALTER TABLE products ADD PRIMARY KEY (product_id);
+        ALTER TABLE orders ADD PRIMARY KEY (order_id);
+        ALTER TABLE order_items ADD PRIMARY KEY (order_item_id);
     """)
 
 
-def populate_users(conn, num_users: int):
-    """Populate users table with realistic data."""
+def populate_users(conn, rng: np.random.Generator, num_users: int) -> np.ndarray:
+    """Populate users table with realistic data.
+
+    Returns:
+        IDs of the active users
+    """
     first_names = [
         "John",
         "Jane",
@@ -189,65 +223,82 @@ def populate_users(conn, num_users: int):
         "San Jose",
     ]
 
-    users = []
-    start_date = datetime(2020, 1, 1)
+    user_ids = np.arange(1, num_users + 1)
 
-    for i in range(1, num_users + 1):
-        first = random.choice(first_names)
-        last = random.choice(last_names)
+    first_idx = rng.integers(0, len(first_names), num_users)
+    last_idx = rng.integers(0, len(last_names), num_users)
+    first = np.array(first_names)[first_idx]
+    last = np.array(last_names)[last_idx]
 
-        # Some users have no email (data quality issue)
-        email = (
-            f"{first.lower()}.{last.lower()}{i}@example.com"
-            if random.random() > 0.05
-            else None
+    # Some users have no email (data quality issue)
+    first_lower = [name.lower() for name in first_names]
+    last_lower = [name.lower() for name in last_names]
+    emails = [
+        first_lower[first_i] + "." + last_lower[last_i] + str(user_id) + "@example.com"
+        for user_id, first_i, last_i in zip(
+            user_ids.tolist(), first_idx.tolist(), last_idx.tolist()
         )
+    ]
+    email = pa.array(emails, mask=rng.random(num_users) <= 0.05)
 
-        # Some users have no phone
-        phone = (
-            f"+1-555-{random.randint(100, 999)}-{random.randint(1000, 9999)}"
-            if random.random() > 0.1
-            else None
+    # Some users have no phone
+    phones = [
+        f"+1-555-{a}-{b}"
+        for a, b in zip(
+            rng.integers(100, 1000, num_users), rng.integers(1000, 10000, num_users)
         )
+    ]
+    phone = pa.array(phones, mask=rng.random(num_users) <= 0.1)
 
-        country = random.choice(countries)
-        state = random.choice(us_states) if country == "USA" else None
-        city = random.choice(cities) if random.random() > 0.05 else None
-
-        signup_days = random.randint(0, 1500)
-        signup_date = start_date + timedelta(days=signup_days)
-
-        is_active = random.random() > 0.15  # 85% active
-        total_orders = random.randint(0, 50) if is_active else random.randint(0, 5)
-        total_spent = round(random.uniform(0, 5000), 2) if total_orders > 0 else 0.0
-
-        users.append(
-            (
-                i,
-                email,
-                first,
-                last,
-                phone,
-                country,
-                state,
-                city,
-                signup_date,
-                is_active,
-                total_orders,
-                total_spent,
-            )
-        )
+    country = np.array(countries)[rng.integers(0, len(countries), num_users)]
+    state = pa.array(
+        np.array(us_states)[rng.integers(0, len(us_states), num_users)],
+        mask=country != "USA",
+    )
+    city = pa.array(
+        np.array(cities)[rng.integers(0, len(cities), num_users)],
+        mask=rng.random(num_users) <= 0.05,
+    )
+
+    start_date = np.datetime64("2020-01-01")
+    signup_date = start_date + rng.integers(0, 1501, num_users).astype("timedelta64[D]")
 
-    conn.executemany(
-        """
-        INSERT INTO users VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-        users,
+    is_active = rng.random(num_users) > 0.15  # 85% active
+    total_orders = np.where(
+        is_active, rng.integers(0, 51, num_users), rng.integers(0, 6, num_users)
     )
+    total_spent = np.where(total_orders > 0, rng.uniform(0, 5000, num_users), 0.0)
+
+    insert_columns(
+        conn,
+        "users",
+        {
+            "user_id": user_ids,
+            "email": email,
+            "first_name": first,
+            "last_name": last,
+            "phone": phone,
+            "country": country,
+            "state": state,
+            "city": city,
+            "signup_date": signup_date,
+            "is_active": is_active,
+            "total_orders": total_orders,
+            "total_spent": total_spent,
+        },
+    )
+
+    return user_ids[is_active]
 
 
-def populate_products(conn, num_products: int):
-    """Populate products table with realistic data."""
+def populate_products(
+    conn, rng: np.random.Generator, num_products: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Populate products table with realistic data.
+
+    Returns:
+        Tuple of (product_ids, prices)
+    """
     categories = {
         "Electronics": ["Laptops", "Phones", "Tablets", "Accessories"],
         "Clothing": ["Men", "Women", "Kids", "Shoes"],
@@ -265,50 +316,62 @@ def populate_products(conn, num_products: int):
         "Budget Suppliers",
     ]
 
-    products = []
-    start_date = datetime(2019, 1, 1)
-
-    for i in range(1, num_products + 1):
-        category = random.choice(list(categories.keys()))
-        subcategory = random.choice(categories[category])
-
-        name = f"{subcategory} Product {i}"
-        price = round(random.uniform(9.99, 999.99), 2)
-        cost = round(price * random.uniform(0.4, 0.7), 2)
-
-        # Some products out of stock
-        stock_quantity = random.randint(0, 500)
-
-        # Some products have no supplier (data quality issue)
-        supplier = random.choice(suppliers) if random.random() > 0.05 else None
-
-        created_days = random.randint(0, 1800)
-        created_at = start_date + timedelta(days=created_days)
-
-        products.append(
-            (
-                i,
-                name,
-                category,
-                subcategory,
-                price,
-                cost,
-                stock_quantity,
-                supplier,
-                created_at,
-            )
-        )
+    product_ids = np.arange(1, num_products + 1)
+
+    # Every category has the same number of subcategories, so a 2-D lookup works
+    category_names = np.array(list(categories))
+    subcategory_names = np.array(list(categories.values()))
+    category_idx = rng.integers(0, len(category_names), num_products)
+    subcategory_idx = rng.integers(0, subcategory_names.shape[1], num_products)
+    category = category_names[category_idx]
+    subcategory = subcategory_names[category_idx, subcategory_idx]
+
+    name = [f"{sub} Product {i}" for i, sub in zip(product_ids, subcategory)]
+    price = rng.uniform(9.99, 999.99, num_products)
+    cost = price * rng.uniform(0.4, 0.7, num_products)
+
+    # Some products out of stock
+    stock_quantity = rng.integers(0, 501, num_products)
 
-    conn.executemany(
-        """
-        INSERT INTO products VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-        products,
+    # Some products have no supplier (data quality issue)
+    supplier = pa.array(
+        np.array(suppliers)[rng.integers(0, len(suppliers), num_products)],
+        mask=rng.random(num_products) <= 0.05,
     )
 
+    start_date = np.datetime64("2019-01-01T00:00:00")
+    created_at = start_date + rng.integers(0, 1801, num_products).astype("timedelta64[D]")
+
+    insert_columns(
+        conn,
+        "products",
+        {
+            "product_id": product_ids,
+            "name": name,
+            "category": category,
+            "subcategory": subcategory,
+            "price": price,
+            "cost": cost,
+            "stock_quantity": stock_quantity,
+            "supplier": supplier,
+            "created_at": created_at,
+        },
+    )
+
+    return product_ids, price
+
+
+def populate_orders(
+    conn, rng: np.random.Generator, num_orders: int, user_ids: np.ndarray
+) -> np.ndarray:
+    """Populate orders table with realistic data.
 
-def populate_orders(conn, num_orders: int):
-    """Populate orders table with realistic data."""
+    Args:
+        user_ids: IDs of the users orders may belong to
+
+    Returns:
+        IDs of the generated orders
+    """
     statuses = ["pending", "processing", "shipped", "delivered", "cancelled"]
     status_weights = [0.05, 0.10, 0.15, 0.60, 0.10]
 
@@ -316,107 +379,100 @@ def populate_orders(conn, num_orders: int):
 
     discount_codes = ["SAVE10", "WELCOME20", "FLASH15", None, None, None, None]
 
-    orders = []
-    start_date = datetime(2022, 1, 1)
-
-    # Get user IDs
-    user_ids = [
-        row[0]
-        for row in conn.execute(
-            "SELECT user_id FROM users WHERE is_active = true"
-        ).fetchall()
-    ]
+    order_ids = np.arange(1, num_orders + 1)
 
-    for i in range(1, num_orders + 1):
-        user_id = random.choice(user_ids)
+    user_id = rng.choice(user_ids, num_orders)
 
-        order_days = random.randint(0, 730)  # Last 2 years
-        order_date = start_date + timedelta(days=order_days)
+    # Last 2 years
+    start_date = np.datetime64("2022-01-01T00:00:00")
+    order_date = start_date + rng.integers(0, 731, num_orders).astype("timedelta64[D]")
 
-        status = random.choices(statuses, weights=status_weights)[0]
+    status = rng.choice(statuses, num_orders, p=status_weights)
 
-        total_amount = round(random.uniform(20, 1000), 2)
+    total_amount = rng.uniform(20, 1000, num_orders)
 
-        # Shipping address sometimes missing (data quality)
-        shipping_address = (
-            f"{random.randint(100, 9999)} Main St, City, ST 12345"
-            if random.random() > 0.02
-            else None
-        )
+    # Shipping address sometimes missing (data quality)
+    addresses = [
+        f"{n} Main St, City, ST 12345" for n in rng.integers(100, 10000, num_orders)
+    ]
+    shipping_address = pa.array(addresses, mask=rng.random(num_orders) <= 0.02)
 
-        payment_method = random.choice(payment_methods)
-        discount_code = random.choice(discount_codes)
-
-        # Shipped/delivered dates based on status
-        shipped_date = None
-        delivered_date = None
-
-        if status in ["shipped", "delivered"]:
-            shipped_date = order_date + timedelta(days=random.randint(1, 3))
-
-            if status == "delivered":
-                delivered_date = shipped_date + timedelta(days=random.randint(1, 7))
-
-        orders.append(
-            (
-                i,
-                user_id,
-                order_date,
-                status,
-                total_amount,
-                shipping_address,
-                payment_method,
-                discount_code,
-                shipped_date,
-                delivered_date,
-            )
-        )
+    payment_method = np.array(payment_methods)[
+        rng.integers(0, len(payment_methods), num_orders)
+    ]
+    discount_code = np.array(discount_codes, dtype=object)[
+        rng.integers(0, len(discount_codes), num_orders)
+    ]
 
-    conn.executemany(
-        """
-        INSERT INTO orders VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-        orders,
+    # Shipped/delivered dates based on status
+    is_shipped = np.isin(status, ["shipped", "delivered"])
+    is_delivered = status == "delivered"
+    shipped_date = order_date + rng.integers(1, 4, num_orders).astype("timedelta64[D]")
+    delivered_date = shipped_date + rng.integers(1, 8, num_orders).astype("timedelta64[D]")
+
+    insert_columns(
+        conn,
+        "orders",
+        {
+            "order_id": order_ids,
+            "user_id": user_id,
+            "order_date": order_date,
+            "status": status,
+            "total_amount": total_amount,
+            "shipping_address": shipping_address,
+            "payment_method": payment_method,
+            "discount_code": discount_code,
+            "shipped_date": pa.array(shipped_date, mask=~is_shipped),
+            "delivered_date": pa.array(delivered_date, mask=~is_delivered),
+        },
     )
 
-
-def populate_order_items(conn):
-    """Populate order items based on orders."""
-    # Get order IDs and product IDs
-    order_ids = [
-        row[0] for row in conn.execute("SELECT order_id FROM orders").fetchall()
-    ]
-    products = conn.execute("SELECT product_id, price FROM products").fetchall()
-
-    order_items = []
-    item_id = 1
-
-    for order_id in order_ids:
-        # Each order has 1-5 items
-        num_items = random.randint(1, 5)
-        order_products = random.sample(products, num_items)
-
-        for product_id, price in order_products:
-            quantity = random.randint(1, 3)
-            unit_price = float(price)
-
-            # Sometimes apply discount
-            discount = (
-                round(random.uniform(0, unit_price * 0.3), 2)
-                if random.random() > 0.7
-                else 0.0
-            )
-
-            order_items.append(
-                (item_id, order_id, product_id, quantity, unit_price, discount)
-            )
-            item_id += 1
-
-    conn.executemany(
-        """
-        INSERT INTO order_items VALUES (?, ?, ?, ?, ?, ?)
-    """,
-        order_items,
+    return order_ids
+
+
+def populate_order_items(
+    conn,
+    rng: np.random.Generator,
+    order_ids: np.ndarray,
+    product_ids: np.ndarray,
+    prices: np.ndarray,
+    max_items: int = 5,
+):
+    """Populate order items based on orders.
+
+    Args:
+        order_ids: IDs of the orders to add items to
+        product_ids: IDs of the products that can be ordered
+        prices: Unit price of each product, aligned with product_ids
+    """
+
+    # Each order has 1-5 distinct products. Partitioning a random key per
+    # (order, product) pair picks max_items distinct products per order in
+    # one call; each order keeps the first num_items of its picks.
+    num_orders = len(order_ids)
+    num_items = rng.integers(1, max_items + 1, num_orders)
+    picks = np.argpartition(
+        rng.random((num_orders, len(product_ids))), max_items - 1, axis=1
+    )[:, :max_items]
+    product_idx = picks[np.arange(max_items) < num_items[:, None]]
+
+    total = int(num_items.sum())
+    unit_price = prices[product_idx]
+
+    # Sometimes apply discount
+    discount = np.where(rng.random(total) > 0.7, rng.uniform(0, unit_price * 0.3), 0.0)
+
+    insert_columns(
+        conn,
+        "order_items",
+        {
+            "order_item_id": np.arange(1, total + 1),
+            "order_id": np.repeat(order_ids, num_items),
+            "product_id": product_ids[product_idx],
+            "quantity": rng.integers(1, 4, total),
+            "unit_price": unit_price,
+            "discount": discount,
+        },
     )
 
 
@@ -5,16 +5,38 @@ This creates a database with metrics over time, useful for testing
 the summary agent's ability to detect trends and anomalies.
 """
 
-import random
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Any
 
 import duckdb
-
-
-def create_database(db_path: str = "data/sample_timeseries.duckdb"):
+import numpy as np
+import pyarrow as pa
+
+# Seed for the random generators; set SEED to produce a different dataset
+SEED = int(os.environ.get("SEED", "42"))
+
+# Event messages, keyed by event type
+FIXED_MESSAGES = {
+    "user_login": "User logged in successfully",
+    "user_logout": "User logged out",
+}
+TEMPLATED_MESSAGES = {
+    "api_call": ("API endpoint called: /api/v1/{}", ["users", "orders", "products"]),
+    "error": (
+        "Error processing request: {}",
+        ["timeout", "connection_refused", "validation_failed"],
+    ),
+    "warning": ("Warning: {}", ["high_memory_usage", "slow_query", "deprecated_api"]),
+}
+
+
+def create_database(db_path: str = "data/sample_timeseries.duckdb", seed: int = SEED):
     """Create a time-series metrics database."""
 
+    rng = np.random.default_rng(seed)
+
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
     # Delete existing database if it exists
@@ -26,17 +48,26 @@ def create_database(db_path: str = "data/sample_timeseries.duckdb"):
     print(f"Creating time-series database at: {db_path}")
     conn = duckdb.connect(db_path)
 
+    # Bulk load: let DuckDB reorder rows while writing and load everything
+    # in one transaction so there is a single commit instead of one per table
+    conn.execute("SET preserve_insertion_order = false")
+    conn.begin()
+
     # Create tables
     print("Creating tables...")
-    create_metrics_table(conn)
-    create_events_table(conn)
+    create_tables(conn)
 
     # Populate with data
     print("Populating metrics...")
-    populate_metrics(conn, days=90)
+    populate_metrics(conn, days=90, seed=rng.random())
 
     print("Populating events...")
-    populate_events(conn, days=90)
+    populate_events(conn, rng, days=90)
+
+    conn.commit()
+
+    print("Adding primary keys...")
+    add_primary_keys(conn)
 
     # Print summary
     print("\n" + "="*50)
@@ -53,8 +84,27 @@ def create_database(db_path: str = "data/sample_timeseries.duckdb"):
     conn.close()
 
 
-def create_metrics_table(conn):
-    """Create daily metrics table."""
+def insert_columns(conn, table: str, columns: dict[str, Any]):
+    """Bulk-insert column arrays into a table via a registered Arrow table.
+
+    Arrow buffers are scanned by DuckDB directly, so the whole batch goes
+    through one INSERT ... SELECT instead of one bound INSERT per row.
+    Columns must be given in table order.
+    """
+    view = f"_{table}_staging"
+    conn.register(view, pa.table(columns))
+    try:
+        conn.execute(f"INSERT INTO {table} SELECT * FROM {view}")
+    finally:
+        conn.unregister(view)
+
+
+def create_tables(conn):
+    """Create the time-series tables in a single multi-statement execute.
+
+    Primary keys are left off here so rows are not checked against an ART
+    index during the bulk load; see add_primary_keys.
+    """
     conn.execute("""
         CREATE TABLE daily_metrics (
             metric_date DATE,
@@ -65,143 +115,145 @@ def create_metrics_table(conn):
             avg_session_duration DECIMAL(10,2),
             error_rate DECIMAL(5,4),
             api_latency_ms DECIMAL(10,2)
-        )
-    """)
-
+        );
 
-def create_events_table(conn):
-    """Create system events table."""
-    conn.execute("""
         CREATE TABLE system_events (
-            event_id INTEGER PRIMARY KEY,
+            event_id INTEGER,
             event_timestamp TIMESTAMP,
             event_type VARCHAR,
             severity VARCHAR,
             source VARCHAR,
             message VARCHAR,
             user_id INTEGER
-        )
+        );
     """)
 
 
-def populate_metrics(conn, days: int):
-    """Populate metrics with realistic time-series data."""
-    start_date = datetime.now() - timedelta(days=days)
-
-    metrics = []
-    base_users = 10000
-    base_pageviews = 50000
-    base_revenue = 10000
-
-    for day in range(days):
-        date = start_date + timedelta(days=day)
-
-        # Growth trend
-        growth_factor = 1 + (day / days) * 0.2  # 20% growth over period
-
-        # Weekly seasonality (weekends lower)
-        is_weekend = date.weekday() >= 5
-        weekend_factor = 0.7 if is_weekend else 1.0
-
-        # Random variation
-        daily_variation = random.uniform(0.9, 1.1)
-
-        # Apply factors
-        factor = growth_factor * weekend_factor * daily_variation
-
-        active_users = int(base_users * factor)
-        new_signups = int(active_users * random.uniform(0.02, 0.05))
-        page_views = int(base_pageviews * factor)
-        revenue = round(base_revenue * factor, 2)
+def add_primary_keys(conn):
+    """Add primary keys once the tables are loaded, building each index in one pass."""
+    conn.execute("ALTER TABLE system_events ADD PRIMARY KEY (event_id)")
+
+
+def populate_metrics(conn, days: int, seed: float):
+    """Populate metrics with realistic time-series data.
+
+    The whole series is generated inside DuckDB from range(), so no rows
+    cross the Python boundary. DuckDB's random() is seeded with seed, which
+    must be between 0 and 1.
+    """
+    conn.execute("SELECT setseed(?)", [seed])
+    conn.execute(f"""
+        INSERT INTO daily_metrics
+        WITH series AS MATERIALIZED (
+            SELECT
+                day,
+                current_date - {days} + day::INTEGER AS metric_date,
+                -- 20% growth over the period, weekends lower, random variation
+                (1 + day / {days} * 0.2)
+                    * (CASE WHEN isodow(current_date - {days} + day::INTEGER) >= 6
+                        THEN 0.7 ELSE 1.0 END)
+                    * (0.9 + random() * 0.2) AS factor
+            FROM range({days}) t(day)
+        ),
+        scaled AS MATERIALIZED (
+            SELECT *, CAST(floor(10000 * factor) AS INTEGER) AS active_users
+            FROM series
+        )
+        SELECT
+            metric_date,
+            active_users,
+            CAST(floor(active_users * (0.02 + random() * 0.03)) AS INTEGER) AS new_signups,
+            CAST(floor(50000 * factor) AS INTEGER) AS page_views,
+            round(10000 * factor, 2) AS revenue,
+            -- Session duration (minutes)
+            round(3.5 + random() * 4.0, 2) AS avg_session_duration,
+            -- Anomaly: sudden spike in errors around day 60
+            CASE
+                WHEN day BETWEEN 58 AND 62 THEN round(0.15 + random() * 0.10, 4)
+                ELSE round(0.001 + random() * 0.004, 4)
+            END AS error_rate,
+            -- Anomaly: latency spike around day 30
+            CASE
+                WHEN day BETWEEN 28 AND 32 THEN round(300 + random() * 200, 2)
+                ELSE round(80 + random() * 70, 2)
+            END AS api_latency_ms
+        FROM scaled
+        ORDER BY day
+    """)
 
-        # Session duration (minutes)
-        avg_session = round(random.uniform(3.5, 7.5), 2)
 
-        # Introduce anomaly: sudden spike in errors around day 60
-        if 58 <= day <= 62:
-            error_rate = round(random.uniform(0.15, 0.25), 4)  # High error rate
-        else:
-            error_rate = round(random.uniform(0.001, 0.005), 4)  # Normal
+def populate_events(conn, rng: np.random.Generator, days: int, batch_days: int = 7):
+    """Populate system events.
 
-        # API latency
-        api_latency = round(random.uniform(80, 150), 2)
+    Events are generated and inserted a few days at a time so only one
+    batch of column arrays is held in memory at once.
+    """
+    day = np.arange(days)
 
-        # Introduce anomaly: latency spike around day 30
-        if 28 <= day <= 32:
-            api_latency = round(random.uniform(300, 500), 2)
+    # Number of events per day varies, with more during anomaly periods
+    anomaly = ((day >= 58) & (day <= 62)) | ((day >= 28) & (day <= 32))
+    num_events = np.where(
+        anomaly, rng.integers(800, 1201, days), rng.integers(100, 501, days)
+    )
+    first_ids = np.concatenate(([1], 1 + np.cumsum(num_events)))
 
-        metrics.append((
-            date.date(), active_users, new_signups, page_views, revenue,
-            avg_session, error_rate, api_latency
-        ))
+    start_date = np.datetime64(datetime.now().date() - timedelta(days=days), "s")
 
-    conn.executemany("""
-        INSERT INTO daily_metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, metrics)
+    for lo in range(0, days, batch_days):
+        hi = min(lo + batch_days, days)
+        events = generate_events(
+            rng, start_date, day[lo:hi], num_events[lo:hi], first_id=int(first_ids[lo])
+        )
+        insert_columns(conn, "system_events", events)
 
 
-def populate_events(conn, days: int):
-    """Populate system events."""
+def generate_events(rng, start_date, day, num_events, first_id: int) -> dict[str, Any]:
+    """Generate system_events columns for a batch of days."""
     event_types = ["user_login", "user_logout", "api_call", "error", "warning", "deployment"]
-    severities = ["info", "warning", "error", "critical"]
     sources = ["web_app", "api_server", "database", "cache", "worker"]
 
-    start_date = datetime.now() - timedelta(days=days)
-
-    events = []
-    event_id = 1
-
-    # Generate events throughout the period
-    for day in range(days):
-        date = start_date + timedelta(days=day)
-
-        # Number of events per day varies
-        num_events = random.randint(100, 500)
-
-        # More errors during anomaly periods
-        if 58 <= day <= 62 or 28 <= day <= 32:
-            num_events = random.randint(800, 1200)
-
-        for _ in range(num_events):
-            # Random time during the day
-            hour = random.randint(0, 23)
-            minute = random.randint(0, 59)
-            second = random.randint(0, 59)
-            timestamp = date.replace(hour=hour, minute=minute, second=second)
-
-            event_type = random.choice(event_types)
-
-            # Severity distribution
-            if event_type == "error":
-                severity = random.choices(["error", "critical"], weights=[0.8, 0.2])[0]
-            elif event_type == "warning":
-                severity = "warning"
-            else:
-                severity = "info"
-
-            source = random.choice(sources)
-
-            # Generate message based on event type
-            messages = {
-                "user_login": "User logged in successfully",
-                "user_logout": "User logged out",
-                "api_call": f"API endpoint called: /api/v1/{random.choice(['users', 'orders', 'products'])}",
-                "error": f"Error processing request: {random.choice(['timeout', 'connection_refused', 'validation_failed'])}",
-                "warning": f"Warning: {random.choice(['high_memory_usage', 'slow_query', 'deprecated_api'])}",
-                "deployment": f"Deployment completed: version {random.randint(1, 10)}.{random.randint(0, 20)}.{random.randint(0, 50)}"
-            }
-            message = messages[event_type]
-
-            user_id = random.randint(1, 1000) if event_type in ["user_login", "user_logout"] else None
-
-            events.append((
-                event_id, timestamp, event_type, severity, source, message, user_id
-            ))
-            event_id += 1
-
-    conn.executemany("""
-        INSERT INTO system_events VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, events)
+    total = int(num_events.sum())
+
+    # Random time during each event's day
+    event_day = np.repeat(day, num_events).astype("timedelta64[D]")
+    timestamps = start_date + event_day + rng.integers(0, 86400, total).astype("timedelta64[s]")
+
+    event_type = np.array(event_types)[rng.integers(0, len(event_types), total)]
+
+    # Generate message based on event type, drawing only the variant each event needs
+    message = np.empty(total, dtype=object)
+    for kind, text in FIXED_MESSAGES.items():
+        message[event_type == kind] = text
+    for kind, (template, options) in TEMPLATED_MESSAGES.items():
+        mask = event_type == kind
+        message[mask] = [template.format(o) for o in rng.choice(options, mask.sum())]
+    is_deployment = event_type == "deployment"
+    versions = rng.integers([1, 0, 0], [11, 21, 51], (is_deployment.sum(), 3))
+    message[is_deployment] = [
+        f"Deployment completed: version {major}.{minor}.{patch}"
+        for major, minor, patch in versions
+    ]
+
+    source = np.array(sources)[rng.integers(0, len(sources), total)]
+
+    is_session_event = np.isin(event_type, ["user_login", "user_logout"])
+    user_id = pa.array(rng.integers(1, 1001, total), mask=~is_session_event)
+
+    # Severity distribution
+    severity = np.full(total, "info", dtype=object)
+    severity[event_type == "warning"] = "warning"
+    is_error = event_type == "error"
+    severity[is_error] = rng.choice(["error", "critical"], is_error.sum(), p=[0.8, 0.2])
+
+    return {
+        "event_id": np.arange(first_id, first_id + total),
+        "event_timestamp": timestamps,
+        "event_type": event_type,
+        "severity": severity,
+        "source": source,
+        "message": message,
+        "user_id": user_id,
+    }
 
 
 if __name__ == "__main__":
@@ -6,15 +6,8 @@ set -e
 echo "Creating sample databases..."
 echo ""
 
-# Create e-commerce database
-echo "1. Creating e-commerce database..."
-uv run python python_bootstrap_scripts/create_sample_db.py
-
-echo ""
-
-# Create time-series database
-echo "2. Creating time-series database..."
-uv run python python_bootstrap_scripts/create_timeseries_db.py
+# Create the e-commerce and time-series databases in parallel
+uv run python python_bootstrap_scripts/bootstrap_all.py
 
 echo ""
 echo "="*60
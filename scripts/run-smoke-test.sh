@@ -46,7 +46,7 @@ echo
 echo "🚀 Running smoke tests..."
 echo
 
-uv run python scripts/smoke_test.py
+uv run --extra dev python scripts/smoke_test.py
 
 echo
 echo "🎉 Smoke tests complete!"
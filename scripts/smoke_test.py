@@ -10,38 +10,53 @@ Environment variables:
     CATALOGER_API_URL: Service URL (default: http://localhost:8000)
     AUTH_SECRET: JWT secret for token generation (default: from .env.server)
     DB_PATH: Path to test database (default: data/sample_ecommerce.duckdb)
+    SMOKE_REUSE_CATALOG: Set to 1 to reuse the last catalog generated for
+        SMOKE_PREFIX instead of generating a new one on every run
+    SMOKE_PREFIX: S3 prefix used when reusing catalogs (default: smoke-test/fixed)
+    SMOKE_HTTP2: Set to 1 to negotiate HTTP/2 with servers that support it
 """
 
+import json
 import os
+import re
+import socket
 import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-import requests
-from html.parser import HTMLParser
-from jose import jwt
+import httpx
+import jwt
+import lxml.html
+import orjson
+from lxml import etree
 
+# Markers the tests look for in raw response bodies
+HTML_TAG = b"<html"
+BODY_TAG = b"<body"
+PRE_TAG = b"<pre>"
+CONTEXT_HEADER = b"Context Summary"
+CATALOG_FILE = b"catalog.html"
+SUMMARY_FILE = b"recent_summary.html"
 
-class HTMLValidator(HTMLParser):
-    """Simple HTML validator to check for well-formed HTML."""
+# Fail fast when the server is unreachable, but give responses time to arrive
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=1.0)
+CATALOG_TIMEOUT = httpx.Timeout(120.0, connect=1.0)
 
-    def __init__(self):
-        super().__init__()
-        self.errors = []
-        self.has_html_tag = False
-        self.has_body_tag = False
+# Retry GETs that hit a transient gateway error
+RETRY_STATUSES = frozenset([502, 503, 504])
 
-    def handle_starttag(self, tag, attrs):
-        if tag == "html":
-            self.has_html_tag = True
-        elif tag == "body":
-            self.has_body_tag = True
+# Catalog timestamps from earlier runs, keyed by prefix (used with SMOKE_REUSE_CATALOG)
+CATALOG_CACHE_FILE = Path(tempfile.gettempdir()) / "cataloger-smoke-catalogs.json"
 
-    def error(self, message):
-        self.errors.append(message)
+# Matches the AUTH_SECRET export in .env.server, with or without quotes
+AUTH_SECRET_PATTERN = re.compile(
+    rb"""^\s*export\s+AUTH_SECRET\s*=\s*["']?([^"'\r\n]+)["']?\s*$""", re.MULTILINE
+)
 
 
-def validate_html(content: str) -> tuple[bool, list[str]]:
+def validate_html(content: bytes) -> tuple[bool, list[str]]:
     """Validate HTML content.
 
     Returns:
@@ -50,16 +65,15 @@ def validate_html(content: str) -> tuple[bool, list[str]]:
     if not content:
         return False, ["Empty content"]
 
-    validator = HTMLValidator()
     try:
-        validator.feed(content)
-    except Exception as e:
+        tree = lxml.html.fromstring(content)
+    except (etree.ParserError, ValueError) as e:
         return False, [f"HTML parsing error: {e}"]
 
-    errors = validator.errors.copy()
+    errors = []
 
     # Basic structure checks
-    if not validator.has_html_tag:
+    if tree.tag != "html" and tree.find(".//html") is None:
         errors.append("Missing <html> tag")
 
     if len(content) < 100:
@@ -68,6 +82,44 @@ def validate_html(content: str) -> tuple[bool, list[str]]:
     return len(errors) == 0, errors
 
 
+def quick_html_check(body: bytes) -> tuple[bool, list[str]]:
+    """Check a response body looks like an HTML page without parsing it.
+
+    Used where a test already searches the body for its own content, so a
+    full parse would only confirm the document structure.
+
+    Returns:
+        (is_valid, errors)
+    """
+    errors = []
+    if HTML_TAG not in body:
+        errors.append("Missing <html> tag")
+    if BODY_TAG not in body:
+        errors.append("Missing <body> tag")
+    if len(body) < 100:
+        errors.append("Content suspiciously short")
+    return len(errors) == 0, errors
+
+
+def find_missing(resp: httpx.Response, needles: list[bytes]) -> list[bytes]:
+    """Stream a response body and return the needles that never appear in it.
+
+    Reading stops as soon as every needle has been seen, and the body is
+    never decoded. The response must come from Client.stream().
+    """
+    missing = list(needles)
+    overlap = max(len(needle) for needle in needles) - 1
+    tail = b""
+    for chunk in resp.iter_bytes(chunk_size=8192):
+        # Keep the end of the previous chunk so needles split across chunks match
+        window = tail + chunk
+        missing = [needle for needle in missing if needle not in window]
+        if not missing:
+            break
+        tail = window[-overlap:] if overlap else b""
+    return missing
+
+
 def generate_token(secret: str) -> str:
     """Generate a test JWT token."""
     payload = {
@@ -77,6 +129,37 @@ def generate_token(secret: str) -> str:
     return jwt.encode(payload, secret, algorithm="HS256")
 
 
+class SmokeTransport(httpx.HTTPTransport):
+    """HTTP transport with keepalive sockets that retries transient errors on GETs.
+
+    Connection failures are retried by httpx itself; gateway errors are
+    retried here with exponential backoff. POSTs create catalogs and
+    comments, so they are never retried.
+    """
+
+    socket_options = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def __init__(self, retries: int = 3, backoff_factor: float = 0.1, **kwargs):
+        super().__init__(retries=retries, socket_options=self.socket_options, **kwargs)
+        self.status_retries = retries
+        self.backoff_factor = backoff_factor
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.status_retries + 1):
+            resp = super().handle_request(request)
+            if (
+                request.method != "GET"
+                or resp.status_code not in RETRY_STATUSES
+                or attempt == self.status_retries
+            ):
+                return resp
+            resp.close()
+            time.sleep(self.backoff_factor * 2**attempt)
+
+
 class SmokeTest:
     """Smoke test runner."""
 
@@ -84,23 +167,53 @@ class SmokeTest:
         self.base_url = base_url.rstrip("/")
         self.auth_token = auth_token
         self.db_path = db_path
-        self.test_prefix = f"smoke-test/{int(time.time())}"
+        self.reuse_catalog = os.getenv("SMOKE_REUSE_CATALOG") == "1"
+        if self.reuse_catalog:
+            self.test_prefix = os.getenv("SMOKE_PREFIX", "smoke-test/fixed")
+        else:
+            self.test_prefix = f"smoke-test/{time.time_ns()}"
+        self.prefix_bytes = self.test_prefix.encode()
         self.catalog_timestamp = None
         self.passed = 0
         self.failed = 0
 
+        # One client for every test so connections are kept alive and reused.
+        # HTTP/2 lets the concurrent checks share a connection, but needs the
+        # h2 package and a server that speaks it, so it is opt-in.
+        transport = SmokeTransport(
+            http2=os.getenv("SMOKE_HTTP2") == "1",
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+        )
+        self.client = httpx.Client(
+            transport=transport,
+            timeout=DEFAULT_TIMEOUT,
+            headers={
+                "Authorization": f"Bearer {auth_token}",
+                "Accept-Encoding": "gzip, deflate",
+            },
+        )
+
     def run(self):
         """Run all smoke tests."""
-        print(f"🧪 Running smoke tests against {self.base_url}")
-        print(f"📊 Test database: {self.db_path}")
-        print(f"🔑 Auth token: {self.auth_token[:20]}...")
-        print()
-
-        tests = [
+        self._write([
+            f"🧪 Running smoke tests against {self.base_url}",
+            f"📊 Test database: {self.db_path}",
+            f"🔑 Auth token: {self.auth_token[:20]}...",
+            "",
+        ])
+
+        if not self._wait_ready():
+            print(f"❌ Server not ready at {self.base_url}")
+            return False
+
+        # Read-only checks that don't depend on a catalog run concurrently
+        parallel_tests = [
             ("Health Check", self.test_healthz),
             ("Metrics Endpoint", self.test_metrics),
             ("Auth Check", self.test_whoami),
             ("Home Page", self.test_home),
+        ]
+        tests = [
             ("Generate Catalog", self.test_create_catalog),
             ("Current View", self.test_current_view),
             ("Timelapse View", self.test_timelapse_view),
@@ -112,75 +225,151 @@ class SmokeTest:
             ("Context Summary After Comment", self.test_context_after_comment),
         ]
 
+        with ThreadPoolExecutor(max_workers=len(parallel_tests)) as executor:
+            futures = {executor.submit(self._check, func): name for name, func in parallel_tests}
+            # Results are reported from this thread only, so counters need no lock.
+            # They finish close together, so the group is written out at once.
+            lines = [
+                f"Testing: {futures[future]}... {self._record(future.result())}"
+                for future in as_completed(futures)
+            ]
+        self._write(lines)
+
         for name, test_func in tests:
             self._run_test(name, test_func)
 
-        print()
-        print("=" * 60)
-        print(f"✅ Passed: {self.passed}")
-        print(f"❌ Failed: {self.failed}")
-        print("=" * 60)
+        self._write([
+            "",
+            "=" * 60,
+            f"✅ Passed: {self.passed}",
+            f"❌ Failed: {self.failed}",
+            "=" * 60,
+        ])
 
         return self.failed == 0
 
+    def _wait_ready(self, max_wait: float = 30.0) -> bool:
+        """Poll /healthz with exponential backoff until the server responds.
+
+        This also opens a pooled connection that the tests then reuse.
+        """
+        deadline = time.monotonic() + max_wait
+        delay = 0.05
+        while True:
+            try:
+                resp = self.client.get(f"{self.base_url}/healthz", timeout=0.5)
+                if resp.status_code == 200:
+                    return True
+            except httpx.HTTPError:
+                pass
+
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
     def _run_test(self, name: str, test_func):
         """Run a single test."""
-        print(f"Testing: {name}...", end=" ")
+        # Printed before running so slow tests show what they are waiting on
+        print(f"Testing: {name}...", end=" ", flush=True)
+        print(self._record(self._check(test_func)))
+
+    def _check(self, test_func) -> str | None:
+        """Run a test function, returning its failure message or None if it passed."""
         try:
             test_func()
-            print("✅")
-            self.passed += 1
         except AssertionError as e:
-            print(f"❌ {e}")
-            self.failed += 1
+            return str(e)
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
-            self.failed += 1
+            return f"Unexpected error: {e}"
+        return None
+
+    def _record(self, error: str | None) -> str:
+        """Count the outcome of a test and return its status marker."""
+        if error is None:
+            self.passed += 1
+            return "✅"
+        self.failed += 1
+        return f"❌ {error}"
+
+    @staticmethod
+    def _write(lines: list[str]):
+        """Write a block of output lines with a single write and flush."""
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+    def _previous_catalog_timestamp(self) -> str | None:
+        """Return the timestamp of an earlier run's catalog if it still exists."""
+        try:
+            timestamp = json.loads(CATALOG_CACHE_FILE.read_text()).get(self.test_prefix)
+        except (OSError, ValueError):
+            return None
+        if not timestamp:
+            return None
+
+        resp = self.client.get(
+            f"{self.base_url}/api/catalog/list",
+            params={"prefix": self.test_prefix, "timestamp": timestamp},
+        )
+        if resp.status_code == 200 and CATALOG_FILE in resp.content:
+            return timestamp
+        return None
+
+    def _save_catalog_timestamp(self, timestamp: str):
+        """Remember the catalog generated for this prefix for later runs."""
+        try:
+            cache = json.loads(CATALOG_CACHE_FILE.read_text())
+        except (OSError, ValueError):
+            cache = {}
+        cache[self.test_prefix] = timestamp
+        CATALOG_CACHE_FILE.write_text(json.dumps(cache))
 
     def test_healthz(self):
         """Test /healthz endpoint."""
-        resp = requests.get(f"{self.base_url}/healthz", timeout=5)
+        resp = self.client.get(f"{self.base_url}/healthz")
         assert resp.status_code == 200, f"Status {resp.status_code}"
-        data = resp.json()
+        data = orjson.loads(resp.content)
         assert data["status"] == "ok", f"Unexpected status: {data}"
 
     def test_metrics(self):
         """Test /metrics endpoint."""
-        resp = requests.get(f"{self.base_url}/metrics", timeout=5)
+        resp = self.client.get(f"{self.base_url}/metrics")
         assert resp.status_code == 200, f"Status {resp.status_code}"
         assert "http_requests_total" in resp.text or "python_info" in resp.text, \
             "Missing expected Prometheus metrics"
 
     def test_whoami(self):
         """Test /whoami endpoint with auth."""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
-        resp = requests.get(f"{self.base_url}/whoami", headers=headers, timeout=5)
+        resp = self.client.get(f"{self.base_url}/whoami")
         assert resp.status_code == 200, f"Status {resp.status_code}"
-        data = resp.json()
+        data = orjson.loads(resp.content)
         assert "claims" in data, "Missing claims in response"
         assert data["claims"]["sub"] == "smoke-test", f"Unexpected subject: {data['claims']}"
 
     def test_home(self):
         """Test home page."""
-        resp = requests.get(f"{self.base_url}/", timeout=5)
+        resp = self.client.get(f"{self.base_url}/")
         assert resp.status_code == 200, f"Status {resp.status_code}"
         assert "text/html" in resp.headers.get("content-type", ""), "Not HTML response"
 
-        is_valid, errors = validate_html(resp.text)
+        body = resp.content
+        is_valid, errors = validate_html(body)
         assert is_valid, f"Invalid HTML: {errors}"
 
         # Check for expected content
-        assert "cataloger" in resp.text.lower(), "Missing 'cataloger' in home page"
+        assert b"cataloger" in body.lower(), "Missing 'cataloger' in home page"
 
     def test_create_catalog(self):
-        """Test POST /catalog endpoint."""
-        if not os.path.exists(self.db_path):
-            raise AssertionError(f"Database not found: {self.db_path}. Run bootstrap-db.sh first.")
+        """Test POST /catalog endpoint.
 
-        headers = {
-            "Authorization": f"Bearer {self.auth_token}",
-            "Content-Type": "application/json",
-        }
+        main() has already checked that the database exists.
+        """
+        if self.reuse_catalog:
+            timestamp = self._previous_catalog_timestamp()
+            if timestamp:
+                self.catalog_timestamp = timestamp
+                print(f"\n    Reusing catalog timestamp: {timestamp}", end=" ")
+                return
 
         # Use container path (data/ is mounted to /data in container)
         # Host: data/sample_ecommerce.duckdb -> Container: /data/sample_ecommerce.duckdb
@@ -194,15 +383,14 @@ class SmokeTest:
         }
 
         print("\n    (This may take 30-60 seconds)...", end=" ")
-        resp = requests.post(
+        resp = self.client.post(
             f"{self.base_url}/catalog",
-            headers=headers,
             json=payload,
-            timeout=120,  # Agents can take time
+            timeout=CATALOG_TIMEOUT,  # Agents can take time
         )
 
         assert resp.status_code == 200, f"Status {resp.status_code}: {resp.text}"
-        data = resp.json()
+        data = orjson.loads(resp.content)
 
         # Validate response structure
         assert "timestamp" in data, "Missing timestamp"
@@ -212,6 +400,8 @@ class SmokeTest:
 
         # Save timestamp for later tests
         self.catalog_timestamp = data["timestamp"]
+        if self.reuse_catalog:
+            self._save_catalog_timestamp(self.catalog_timestamp)
         print(f"\n    Catalog timestamp: {self.catalog_timestamp}", end=" ")
 
     def test_current_view(self):
@@ -219,128 +409,123 @@ class SmokeTest:
         if not self.catalog_timestamp:
             raise AssertionError("No catalog generated yet")
 
-        resp = requests.get(
+        resp = self.client.get(
             f"{self.base_url}/database/current",
             params={"prefix": self.test_prefix},
-            timeout=10,
         )
 
         assert resp.status_code == 200, f"Status {resp.status_code}"
         assert "text/html" in resp.headers.get("content-type", ""), "Not HTML response"
 
-        is_valid, errors = validate_html(resp.text)
+        body = resp.content
+        is_valid, errors = quick_html_check(body)
         assert is_valid, f"Invalid HTML: {errors}"
 
         # Check for expected content
-        assert self.test_prefix in resp.text, "Missing prefix in response"
-        assert self.catalog_timestamp in resp.text, "Missing timestamp in response"
+        assert self.prefix_bytes in body, "Missing prefix in response"
+        assert self.catalog_timestamp.encode() in body, "Missing timestamp in response"
 
     def test_timelapse_view(self):
         """Test GET /database/timelapse."""
         if not self.catalog_timestamp:
             raise AssertionError("No catalog generated yet")
 
-        resp = requests.get(
+        resp = self.client.get(
             f"{self.base_url}/database/timelapse",
             params={"prefix": self.test_prefix},
-            timeout=10,
         )
 
         assert resp.status_code == 200, f"Status {resp.status_code}"
         assert "text/html" in resp.headers.get("content-type", ""), "Not HTML response"
 
-        is_valid, errors = validate_html(resp.text)
+        body = resp.content
+        is_valid, errors = quick_html_check(body)
         assert is_valid, f"Invalid HTML: {errors}"
 
         # Check for expected content
-        assert self.test_prefix in resp.text, "Missing prefix in response"
-        assert self.catalog_timestamp in resp.text, "Missing timestamp in response"
+        assert self.prefix_bytes in body, "Missing prefix in response"
+        assert self.catalog_timestamp.encode() in body, "Missing timestamp in response"
 
     def test_catalog_content_api(self):
         """Test GET /api/catalog/content."""
         if not self.catalog_timestamp:
             raise AssertionError("No catalog generated yet")
 
-        resp = requests.get(
+        resp = self.client.get(
             f"{self.base_url}/api/catalog/content",
             params={
                 "prefix": self.test_prefix,
                 "timestamp": self.catalog_timestamp,
                 "filename": "catalog.html",
             },
-            timeout=10,
         )
 
         assert resp.status_code == 200, f"Status {resp.status_code}"
 
         # API returns HTML fragment
-        assert len(resp.text) > 100, "Response too short"
-        assert "catalog" in resp.text.lower() or "table" in resp.text.lower(), \
-            "Missing expected catalog content"
+        body = resp.content.lower()
+        assert len(body) > 100, "Response too short"
+        assert b"catalog" in body or b"table" in body, "Missing expected catalog content"
 
     def test_catalog_list_api(self):
         """Test GET /api/catalog/list."""
         if not self.catalog_timestamp:
             raise AssertionError("No catalog generated yet")
 
-        resp = requests.get(
+        with self.client.stream(
+            "GET",
             f"{self.base_url}/api/catalog/list",
             params={
                 "prefix": self.test_prefix,
                 "timestamp": self.catalog_timestamp,
             },
-            timeout=10,
-        )
-
-        assert resp.status_code == 200, f"Status {resp.status_code}"
+        ) as resp:
+            assert resp.status_code == 200, f"Status {resp.status_code}"
 
-        # Check for expected filenames in response
-        assert "catalog.html" in resp.text, "Missing catalog.html in list"
-        assert "recent_summary.html" in resp.text, "Missing recent_summary.html in list"
+            # Check for expected filenames in response
+            missing = find_missing(resp, [CATALOG_FILE, SUMMARY_FILE])
+        assert not missing, f"Missing {b', '.join(missing).decode()} in list"
 
     def test_context_summary_html(self):
         """Test GET /catalog/context (HTML)."""
         if not self.catalog_timestamp:
             raise AssertionError("No catalog generated yet")
 
-        resp = requests.get(
+        resp = self.client.get(
             f"{self.base_url}/catalog/context",
             params={"prefix": self.test_prefix},
-            timeout=10,
         )
 
         assert resp.status_code == 200, f"Status {resp.status_code}"
         assert "text/html" in resp.headers.get("content-type", ""), "Not HTML response"
 
-        is_valid, errors = validate_html(resp.text)
+        body = resp.content
+        is_valid, errors = quick_html_check(body)
         assert is_valid, f"Invalid HTML: {errors}"
 
         # Check for expected sections
-        assert "Context Summary" in resp.text, "Missing context summary header"
-        assert self.catalog_timestamp in resp.text, "Missing timestamp in context"
+        assert CONTEXT_HEADER in body, "Missing context summary header"
+        assert self.catalog_timestamp.encode() in body, "Missing timestamp in context"
 
     def test_context_summary_text(self):
         """Test GET /catalog/context with strip_tags=true."""
         if not self.catalog_timestamp:
             raise AssertionError("No catalog generated yet")
 
-        resp = requests.get(
+        resp = self.client.get(
             f"{self.base_url}/catalog/context",
-            params={
-                "prefix": self.test_prefix,
-                "strip_tags": "true",
-            },
-            timeout=10,
+            params={"prefix": self.test_prefix, "strip_tags": "true"},
         )
 
         assert resp.status_code == 200, f"Status {resp.status_code}"
 
         # Should contain text but minimal HTML
-        assert "<pre>" in resp.text, "Missing <pre> wrapper"
-        assert "Context Summary" in resp.text, "Missing context summary text"
+        body = resp.content
+        assert PRE_TAG in body, "Missing <pre> wrapper"
+        assert CONTEXT_HEADER in body, "Missing context summary text"
 
         # Should have fewer tags than full HTML
-        tag_count = resp.text.count("<")
+        tag_count = body.count(b"<")
         assert tag_count < 10, f"Too many HTML tags ({tag_count}) for stripped version"
 
     def test_add_comment(self):
@@ -348,11 +533,6 @@ class SmokeTest:
         if not self.catalog_timestamp:
             raise AssertionError("No catalog generated yet")
 
-        headers = {
-            "Authorization": f"Bearer {self.auth_token}",
-            "Content-Type": "application/json",
-        }
-
         payload = {
             "prefix": self.test_prefix,
             "timestamp": self.catalog_timestamp,
@@ -360,15 +540,13 @@ class SmokeTest:
             "comment": "This is a smoke test comment. Please investigate the null rates in the users table.",
         }
 
-        resp = requests.post(
+        resp = self.client.post(
             f"{self.base_url}/catalog/comment",
-            headers=headers,
             json=payload,
-            timeout=10,
         )
 
         assert resp.status_code == 200, f"Status {resp.status_code}: {resp.text}"
-        data = resp.json()
+        data = orjson.loads(resp.content)
 
         # Validate response structure
         assert "uri" in data, "Missing uri"
@@ -384,18 +562,19 @@ class SmokeTest:
         # Wait a moment for S3 consistency
         time.sleep(1)
 
-        resp = requests.get(
+        resp = self.client.get(
             f"{self.base_url}/catalog/context",
             params={"prefix": self.test_prefix},
-            timeout=10,
         )
 
         assert resp.status_code == 200, f"Status {resp.status_code}"
 
         # Check that our comment appears in the context
-        assert "smoke-test-user" in resp.text, "Missing comment user in context"
-        assert "smoke test comment" in resp.text.lower(), "Missing comment text in context"
-        assert "null rates" in resp.text.lower(), "Missing comment content in context"
+        body = resp.content
+        assert b"smoke-test-user" in body, "Missing comment user in context"
+        body = body.lower()
+        assert b"smoke test comment" in body, "Missing comment text in context"
+        assert b"null rates" in body, "Missing comment content in context"
 
 
 def main():
@@ -408,11 +587,9 @@ def main():
     if not auth_secret:
         env_file = Path(__file__).parent.parent / ".env.server"
         if env_file.exists():
-            with open(env_file) as f:
-                for line in f:
-                    if line.startswith("export AUTH_SECRET="):
-                        auth_secret = line.split("=", 1)[1].strip().strip('"').strip("'")
-                        break
+            match = AUTH_SECRET_PATTERN.search(env_file.read_bytes())
+            if match:
+                auth_secret = match.group(1).decode()
 
     if not auth_secret:
         print("❌ AUTH_SECRET not found. Set environment variable or create .env.server")
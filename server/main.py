@@ -1,33 +1,137 @@
+import asyncio
+import atexit
+import codecs
+import functools
+import hashlib
+import heapq
+import html
 import logging
 import os
+import queue
+import string
 import sys
+import threading
+import time
 import traceback
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
 
-import anthropic
+import jinja2
+import jwt
+import orjson
 import structlog
+from anyio import to_thread
 from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
-from fastapi.responses import HTMLResponse
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    ORJSONResponse,
+    StreamingResponse,
+)
+from fastapi.security import HTTPBearer
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from jose import JWTError, jwt
 from prometheus_fastapi_instrumentator import Instrumentator
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from starlette.concurrency import iterate_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 
-from cataloger.container.pool import ContainerPool
-from cataloger.context import generate_context_summary, strip_html_tags
-from cataloger.storage.s3 import S3Storage
-from cataloger.workflow.catalog import CatalogWorkflow
+from cataloger.context import generate_context_summary, iter_context_summary, strip_html_tags
+
+# anthropic, boto3 and the docker SDK are slow to import, so the modules that
+# pull them in are imported where the services are built
+if TYPE_CHECKING:
+    import anthropic
+
+    from cataloger.container.pool import ContainerPool
+    from cataloger.storage.s3 import S3Storage
+    from cataloger.workflow.catalog import CatalogWorkflow
 
 # -------------------------
 # Logging configuration
 # -------------------------
 
 
+class LogWriter:
+    """Writes rendered log lines to stdout from a background thread.
+
+    Request handlers only enqueue the line, so they never block on stdout.
+    Lines logged while the thread is not running are written directly.
+    """
+
+    def __init__(self, stream=sys.stdout):
+        self._stream = stream
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+            # The thread is a daemon, so drain the queue before the interpreter
+            # exits or lines logged just before sys.exit() are lost
+            atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Flush queued lines and stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def write(self, line: str | bytes) -> None:
+        if self._thread is not None:
+            self._queue.put(line)
+        else:
+            self._write(line)
+            self._stream.flush()
+
+    def _run(self) -> None:
+        while (line := self._queue.get()) is not None:
+            self._write(line)
+            if self._queue.empty():
+                self._stream.flush()
+        self._stream.flush()
+
+    def _write(self, line: str | bytes) -> None:
+        if isinstance(line, bytes):
+            self._stream.buffer.write(line + b"\n")
+        else:
+            self._stream.write(line + "\n")
+
+
+class QueueLogger:
+    """structlog logger that hands rendered lines to a LogWriter."""
+
+    def __init__(self, writer: LogWriter):
+        self._writer = writer
+
+    def msg(self, message: str | bytes) -> None:
+        self._writer.write(message)
+
+    log = debug = info = warn = warning = error = critical = exception = fatal = msg
+
+
+log_writer = LogWriter()
+
+
+_stack_info_renderer = structlog.processors.StackInfoRenderer()
+
+
+def _render_exc_and_stack_info(logger, method_name, event_dict):
+    """Render stack_info and exc_info, if the call asked for either.
+
+    Most records carry neither, so they skip both processors entirely.
+    """
+    if "exc_info" not in event_dict and "stack_info" not in event_dict:
+        return event_dict
+    event_dict = _stack_info_renderer(logger, method_name, event_dict)
+    return structlog.processors.format_exc_info(logger, method_name, event_dict)
+
+
 def configure_logging() -> None:
     log_level_name = os.getenv("LOG_LEVEL", "INFO").upper()
     log_level = getattr(logging, log_level_name, logging.INFO)
@@ -38,20 +142,21 @@ def configure_logging() -> None:
         structlog.contextvars.merge_contextvars,
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
+        _render_exc_and_stack_info,
     ]
     if json_logs:
-        processors.append(structlog.processors.JSONRenderer())
+        # orjson renders straight to bytes, which are written without re-encoding
+        processors.append(structlog.processors.JSONRenderer(serializer=orjson.dumps))
     else:
         processors.append(structlog.dev.ConsoleRenderer())
 
     structlog.configure(
         processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(log_level),
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=lambda *args: QueueLogger(log_writer),
         cache_logger_on_first_use=True,
     )
+    log_writer.start()
 
     # Bind common fields
     structlog.contextvars.bind_contextvars(service=service_name)
@@ -65,33 +170,188 @@ log = structlog.get_logger()
 # -------------------------
 JWT_SECRET = os.getenv("AUTH_SECRET", "change-me")
 JWT_ALG = os.getenv("JWT_ALG", "HS256")
-security = HTTPBearer(auto_error=True)
 
 
-def require_claims(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> Dict:
-    token = credentials.credentials
-    try:
-        claims = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
+class BearerToken(HTTPBearer):
+    """HTTPBearer that returns the raw token string.
+
+    The Authorization header is parsed with a prefix check instead of building
+    HTTPAuthorizationCredentials, and the result is kept on request.state so
+    every dependency that needs the token shares one parse. Registering as an
+    HTTPBearer keeps the security scheme in the OpenAPI docs.
+    """
+
+    async def __call__(self, request: Request) -> str:
+        token = getattr(request.state, "token", None)
+        if token is None:
+            token = _parse_bearer(request.headers.get("authorization", ""))
+            request.state.token = token
+        return token
+
+
+def _parse_bearer(authorization: str) -> str:
+    if authorization[:7].lower() != "bearer ":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated")
+    return authorization[7:].strip()
+
+
+security = BearerToken()
+
+# Token decoder with the key and allowed algorithms bound once at import. The
+# key is prepared up front so decoding doesn't re-derive it from the raw
+# secret per call (which gets expensive for asymmetric algorithms).
+_decode_token = functools.partial(
+    jwt.decode,
+    key=jwt.algorithms.get_default_algorithms()[JWT_ALG].prepare_key(JWT_SECRET),
+    algorithms=[JWT_ALG],
+)
+
+
+@dataclass(slots=True, frozen=True)
+class Claims:
+    """Verified token claims.
+
+    The fields handlers use are pulled out once per token; the full decoded
+    payload is kept for /whoami.
+    """
+
+    sub: str | None
+    exp: float | None
+    payload: dict
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "Claims":
+        exp = payload.get("exp")
+        return cls(
+            sub=payload.get("sub"),
+            exp=exp if isinstance(exp, (int, float)) else None,
+            payload=payload,
         )
+
+
+# Decoded claims keyed by token hash, so repeat requests skip signature checks.
+# Entries never outlive the token's own exp claim.
+CLAIMS_CACHE_TTL = float(os.getenv("CLAIMS_CACHE_TTL", "30"))
+CLAIMS_CACHE_SIZE = 10_000
+_claims_cache: dict[bytes, tuple[float, Claims]] = {}
+_claims_cache_lock = threading.Lock()
+
+
+def _get_cached_claims(key: bytes) -> Claims | None:
+    with _claims_cache_lock:
+        entry = _claims_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del _claims_cache[key]
+            return None
+        return claims
+
+
+def _cache_claims(key: bytes, claims: Claims) -> None:
+    expires_at = time.time() + CLAIMS_CACHE_TTL
+    if claims.exp is not None:
+        expires_at = min(expires_at, claims.exp)
+
+    with _claims_cache_lock:
+        if len(_claims_cache) >= CLAIMS_CACHE_SIZE:
+            # Evict the oldest entry
+            del _claims_cache[next(iter(_claims_cache))]
+        _claims_cache[key] = (expires_at, claims)
+
+
+def _invalid_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _claims_for_token(token: str) -> Claims:
+    # A compact JWS is header.payload.signature; reject anything else before
+    # hashing or decoding it
+    if token.count(".") != 2 or len(token) < 20:
+        raise _invalid_token()
+
+    key = hashlib.sha256(token.encode()).digest()
+    claims = _get_cached_claims(key)
+    if claims is not None:
+        return claims
+
+    try:
+        claims = Claims.from_payload(_decode_token(token))
+    except jwt.InvalidTokenError:
+        raise _invalid_token()
+    _cache_claims(key, claims)
     return claims
 
 
+async def require_claims(token: str = Depends(security)) -> Claims:
+    return _claims_for_token(token)
+
+
+class AuthMiddleware:
+    """ASGI middleware that authenticates POST requests to the given paths.
+
+    The verified claims are stored on request.state.claims, so those endpoints
+    skip dependency resolution for auth. Failures get the same responses as
+    require_claims.
+    """
+
+    def __init__(self, app, paths: set[str]):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        authorization = next(
+            (value for name, value in scope["headers"] if name == b"authorization"), b""
+        )
+        try:
+            claims = _claims_for_token(_parse_bearer(authorization.decode("latin-1")))
+        except HTTPException as e:
+            response = JSONResponse(
+                {"detail": e.detail}, status_code=e.status_code, headers=e.headers
+            )
+            await response(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["claims"] = claims
+        await self.app(scope, receive, send)
+
+
+# POST routes authenticated by AuthMiddleware; they declare the bearer scheme in
+# the OpenAPI docs by hand since they no longer depend on `security`
+AUTH_PATHS = {"/catalog", "/catalog/comment"}
+BEARER_AUTH_DOC = {"security": [{security.scheme_name: []}]}
+
+
 # -------------------------
 # Global state
 # -------------------------
-container_pool: ContainerPool | None = None
-s3_storage: S3Storage | None = None
-catalog_workflow: CatalogWorkflow | None = None
-anthropic_client: anthropic.Anthropic | None = None
+container_pool: "ContainerPool | None" = None
+s3_storage: "S3Storage | None" = None
+catalog_workflow: "CatalogWorkflow | None" = None
+anthropic_client: "anthropic.Anthropic | None" = None
 _services_initialized: bool = False
 
+# Uvicorn worker processes (always one with RELOAD). Each holds its own
+# in-memory caches, and a comment posted through one worker can't invalidate
+# another's, so the context and S3 timestamp caches are turned off when there
+# is more than one.
+WORKERS = (
+    1 if os.getenv("RELOAD", "false").lower() == "true" else int(os.getenv("WORKERS", "1"))
+)
+
 
 # -------------------------
 # App & instrumentation
@@ -99,8 +359,13 @@ _services_initialized: bool = False
 
 
 def initialize_services():
-    """Initialize all services."""
-    global container_pool, s3_storage, catalog_workflow, anthropic_client, _services_initialized
+    """Initialize the services every request path needs.
+
+    Only configuration is validated and the S3 client is built here; the
+    Anthropic client, container pool and catalog workflow are created on the
+    first catalog request (see get_catalog_workflow).
+    """
+    global s3_storage, _services_initialized
 
     # Skip if already initialized (guards against multiple calls in same process)
     if _services_initialized:
@@ -109,15 +374,12 @@ def initialize_services():
 
     log.info("service.initialize")
 
-    # Initialize LLM client (currently using Anthropic)
-    llm_api_key = os.getenv("LLM_API_KEY")
-    if not llm_api_key:
+    from cataloger.storage.s3 import S3Storage
+
+    # Fail fast on missing configuration even though the LLM client is lazy
+    if not os.getenv("LLM_API_KEY"):
         log.error("Missing LLM_API_KEY environment variable")
         sys.exit(1)
-    anthropic_client = anthropic.Anthropic(api_key=llm_api_key)
-
-    # Get model name (defaults to claude-haiku-4-5)
-    model_name = os.getenv("MODEL_NAME", "claude-haiku-4-5")
 
     # Initialize S3 storage
     s3_bucket = os.getenv("S3_BUCKET")
@@ -136,27 +398,112 @@ def initialize_services():
         access_key_id=s3_access_key,
         secret_access_key=s3_secret_key,
         endpoint_url=s3_endpoint_url,
+        max_pool_connections=int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50")),
+        timestamps_ttl=5.0 if WORKERS == 1 else 0.0,
     )
 
-    # Initialize container pool
-    container_image = os.getenv("CONTAINER_IMAGE", "cataloger-agent:latest")
-    pool_size = int(os.getenv("CONTAINER_POOL_SIZE", "5"))
-    container_pool = ContainerPool(image_name=container_image, pool_size=pool_size)
-
-    # Initialize catalog workflow
-    catalog_workflow = CatalogWorkflow(
-        container_pool=container_pool,
-        s3_storage=s3_storage,
-        anthropic_client=anthropic_client,
-        model_name=model_name,
-    )
     _services_initialized = True
-    log.info("service.initialized", model=model_name)
+    log.info("service.initialized")
+
+
+# Guards lazy construction of the services below; create_catalog builds them in
+# a worker thread, so concurrent first requests must not build them twice
+_services_lock = threading.Lock()
+
+
+def get_anthropic() -> "anthropic.Anthropic":
+    """Return the Anthropic client, creating it on first use."""
+    global anthropic_client
+    if anthropic_client is None:
+        with _services_lock:
+            if anthropic_client is None:
+                import anthropic
+
+                # Initialize LLM client (currently using Anthropic)
+                anthropic_client = anthropic.Anthropic(api_key=os.getenv("LLM_API_KEY"))
+    return anthropic_client
+
+
+def get_pool() -> "ContainerPool":
+    """Return the container pool, creating it on first use."""
+    global container_pool
+    if container_pool is None:
+        with _services_lock:
+            if container_pool is None:
+                from cataloger.container.pool import ContainerPool
+
+                container_image = os.getenv("CONTAINER_IMAGE", "cataloger-agent:latest")
+                pool_size = int(os.getenv("CONTAINER_POOL_SIZE", "5"))
+                container_pool = ContainerPool(image_name=container_image, pool_size=pool_size)
+    return container_pool
+
+
+def get_catalog_workflow() -> "CatalogWorkflow":
+    """Return the catalog workflow, creating it (and its services) on first use."""
+    global catalog_workflow
+    if catalog_workflow is None:
+        if s3_storage is None:
+            raise RuntimeError("S3 storage not initialized")
+        pool = get_pool()
+        client = get_anthropic()
+        with _services_lock:
+            if catalog_workflow is None:
+                from cataloger.workflow.catalog import CatalogWorkflow
+
+                # Get model name (defaults to claude-haiku-4-5)
+                model_name = os.getenv("MODEL_NAME", "claude-haiku-4-5")
+                catalog_workflow = CatalogWorkflow(
+                    container_pool=pool,
+                    s3_storage=s3_storage,
+                    anthropic_client=client,
+                    model_name=model_name,
+                )
+                log.info("service.catalog_workflow_initialized", model=model_name)
+    return catalog_workflow
+
+
+# Containers to start at startup; 0 leaves the pool (and docker) untouched
+# until the first catalog request
+CONTAINER_POOL_WARM = int(os.getenv("CONTAINER_POOL_WARM", "0"))
+
+
+async def warm_container_pool(count: int) -> None:
+    """Start up to `count` pool containers concurrently."""
+    try:
+        pool = await asyncio.to_thread(get_pool)
+        started = await asyncio.to_thread(pool.warm, count)
+        log.info("service.pool_warmed", containers=started)
+    except Exception as e:
+        log.warning("service.pool_warm_failed", error=str(e))
+
+
+# Threads available to catalog workflows, sync endpoints and streamed response
+# bodies
+MAX_WORKFLOW_THREADS = int(os.getenv("MAX_WORKFLOW_THREADS", "64"))
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     log.info("service.startup")
+    initialize_services()
+
+    # Compile every template now rather than on the first request that renders it
+    for template_name in templates.env.list_templates():
+        templates.env.get_template(template_name)
+
+    # Catalog workflows hold a thread for their whole run and share anyio's
+    # threadpool (40 threads by default) with sync endpoints
+    to_thread.current_default_thread_limiter().total_tokens = MAX_WORKFLOW_THREADS
+
+    # Open the S3 connection now rather than on the first request
+    try:
+        await asyncio.to_thread(s3_storage.head_bucket)
+    except Exception as e:
+        log.warning("service.startup.s3_unreachable", error=str(e))
+
+    # Optionally start agent containers before the first catalog request
+    if CONTAINER_POOL_WARM > 0:
+        await warm_container_pool(CONTAINER_POOL_WARM)
 
     # Check and log service availability at startup
     all_available, missing = check_service_availability()
@@ -176,6 +523,7 @@ async def lifespan(app: FastAPI):
         log.info("service.shutdown")
         if container_pool:
             container_pool.cleanup()
+        log_writer.stop()
 
 
 # -------------------------
@@ -183,6 +531,10 @@ async def lifespan(app: FastAPI):
 # -------------------------
 
 
+# Bytes of a 5XX response body kept for the error log
+ERROR_BODY_LOG_BYTES = 1024
+
+
 class ErrorLoggingMiddleware(BaseHTTPMiddleware):
     """Middleware to log all 5XX responses with detailed error information."""
 
@@ -190,64 +542,118 @@ class ErrorLoggingMiddleware(BaseHTTPMiddleware):
         try:
             response = await call_next(request)
 
-            # Log all 5XX responses
-            if response.status_code >= 500:
-                # Try to read response body for error details
-                body = b""
-                async for chunk in response.body_iterator:
-                    body += chunk
-
-                # Create new response with same content
-                response = Response(
-                    content=body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers),
-                    media_type=response.media_type,
+            # Log all 5XX responses (skip the body capture if errors aren't logged)
+            if response.status_code >= 500 and log.is_enabled_for(logging.ERROR):
+                response.body_iterator = self._tee_and_log(
+                    request, response.status_code, response.body_iterator
                 )
 
-                # Log the error with full context
+            return response
+
+        except Exception as e:
+            # Log unhandled exceptions; formatting the traceback walks the whole
+            # stack, so only do it if the record will be emitted
+            if log.is_enabled_for(logging.ERROR):
                 log.error(
-                    "http.5xx_response",
-                    status_code=response.status_code,
+                    "http.unhandled_exception",
+                    error=str(e),
+                    error_type=type(e).__name__,
                     method=request.method,
                     url=str(request.url),
                     path=request.url.path,
-                    query_params=dict(request.query_params),
-                    client_host=request.client.host if request.client else None,
-                    response_body=body.decode("utf-8", errors="replace")[:1000],  # First 1000 chars
+                    traceback=traceback.format_exc(),
                 )
+            raise
 
-            return response
+    async def _tee_and_log(self, request: Request, status_code: int, body_iterator):
+        """Stream the response body through unchanged, logging its first bytes once sent.
 
-        except Exception as e:
-            # Log unhandled exceptions
+        Only the first ERROR_BODY_LOG_BYTES bytes are kept for the log, so
+        large error bodies are never buffered in full.
+        """
+        captured = bytearray()
+        try:
+            async for chunk in body_iterator:
+                if len(captured) < ERROR_BODY_LOG_BYTES:
+                    captured += chunk[: ERROR_BODY_LOG_BYTES - len(captured)]
+                yield chunk
+        finally:
+            # Log the error with full context
             log.error(
-                "http.unhandled_exception",
-                error=str(e),
-                error_type=type(e).__name__,
+                "http.5xx_response",
+                status_code=status_code,
                 method=request.method,
                 url=str(request.url),
                 path=request.url.path,
-                traceback=traceback.format_exc(),
+                query_params=dict(request.query_params),
+                client_host=request.client.host if request.client else None,
+                response_body=captured.decode("utf-8", errors="replace")[:1000],  # First 1000 chars
             )
-            raise
-
 
-# Initialize services before creating FastAPI app
-initialize_services()
 
-app = FastAPI(title=os.getenv("SERVICE_NAME", "cataloger"), lifespan=lifespan)
+# orjson serializes straight to bytes, which is faster than the stdlib json
+# encoder for every JSON endpoint
+app = FastAPI(
+    title=os.getenv("SERVICE_NAME", "cataloger"),
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # Add error logging middleware
 app.add_middleware(ErrorLoggingMiddleware)
-
-# Prometheus: exposes /metrics by default
-Instrumentator().instrument(app).expose(app)
+app.add_middleware(AuthMiddleware, paths=AUTH_PATHS)
+
+# Compress responses (catalog HTML and context documents are large and
+# repetitive); level 6 trades a little ratio for much less CPU than 9
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
+# Prometheus: exposes /metrics by default. Probes, scrapes and static files
+# aren't worth a histogram observation per request.
+Instrumentator(
+    excluded_handlers=["/healthz", "/metrics", "/static/.*"],
+    should_group_status_codes=True,
+    should_instrument_requests_inprogress=False,
+).instrument(
+    app,
+    latency_highr_buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+).expose(app)
 
 # Templates and static files
 BASE_DIR = Path(__file__).resolve().parent
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
-app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
+templates = Jinja2Templates(
+    env=jinja2.Environment(
+        loader=jinja2.FileSystemLoader(BASE_DIR / "templates"),
+        autoescape=True,
+        # Only stat template files for changes when running with reload
+        auto_reload=os.getenv("RELOAD", "false").lower() == "true",
+        # The template set is small and fixed; never evict a compiled template
+        cache_size=-1,
+        # Compiled bytecode survives restarts; point JINJA_CACHE_DIR at a
+        # persistent directory to keep it across container restarts too
+        bytecode_cache=jinja2.FileSystemBytecodeCache(os.getenv("JINJA_CACHE_DIR")),
+    )
+)
+
+
+# How long browsers may reuse static assets without revalidating. Asset names
+# aren't content-hashed, so this stays short rather than "immutable".
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "3600"))
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers cache assets for STATIC_MAX_AGE seconds.
+
+    Starlette already answers revalidations with 304 via ETag/Last-Modified;
+    this saves the revalidation round-trip itself on repeat page loads.
+    """
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = f"public, max-age={STATIC_MAX_AGE}"
+        return response
+
+
+app.mount("/static", CachedStaticFiles(directory=str(BASE_DIR / "static")), name="static")
 
 
 # -------------------------
@@ -265,12 +671,6 @@ def check_service_availability():
 
     if s3_storage is None:
         missing.append("s3_storage")
-    if catalog_workflow is None:
-        missing.append("catalog_workflow")
-    if anthropic_client is None:
-        missing.append("anthropic_client")
-    if container_pool is None:
-        missing.append("container_pool")
 
     if missing:
         log.error(
@@ -283,6 +683,60 @@ def check_service_availability():
     return True, []
 
 
+# Latest catalog per prefix, served from memory and refreshed in the background
+# once older than RECENT_CATALOGS_TTL seconds
+RECENT_CATALOGS_TTL = float(os.getenv("RECENT_CATALOGS_TTL", "10"))
+_recent_catalogs: list[dict] | None = None
+_recent_catalogs_fetched_at: float = 0.0
+_recent_catalogs_refresh: asyncio.Task | None = None
+
+
+async def refresh_recent_catalogs() -> list[dict]:
+    """List the latest catalog timestamp for each prefix and cache the result."""
+    global _recent_catalogs, _recent_catalogs_fetched_at
+
+    # Get all prefixes
+    prefixes = await asyncio.to_thread(s3_storage.list_prefixes, limit=50)
+
+    # Get latest timestamp for each prefix, listing all of them concurrently
+    latest = await asyncio.gather(
+        *(asyncio.to_thread(s3_storage.list_timestamps, prefix, limit=1) for prefix in prefixes)
+    )
+    catalogs = [
+        {"prefix": prefix, "timestamp": timestamps[0]}
+        for prefix, timestamps in zip(prefixes, latest)
+        if timestamps
+    ]
+
+    _recent_catalogs = catalogs
+    _recent_catalogs_fetched_at = time.monotonic()
+    return catalogs
+
+
+async def _refresh_recent_catalogs_in_background() -> None:
+    try:
+        await refresh_recent_catalogs()
+    except Exception as e:
+        log.warning("catalog.recent.refresh_failed", error=str(e))
+
+
+async def get_recent_catalogs() -> list[dict]:
+    """Return the cached recent catalogs (stale-while-revalidate).
+
+    Only the first call waits on S3. After that the cached list is returned
+    immediately, and a stale list triggers a single background refresh.
+    """
+    global _recent_catalogs_refresh
+
+    if _recent_catalogs is None:
+        return await refresh_recent_catalogs()
+
+    is_stale = time.monotonic() - _recent_catalogs_fetched_at >= RECENT_CATALOGS_TTL
+    if is_stale and (_recent_catalogs_refresh is None or _recent_catalogs_refresh.done()):
+        _recent_catalogs_refresh = asyncio.create_task(_refresh_recent_catalogs_in_background())
+    return _recent_catalogs
+
+
 # -------------------------
 # Request/Response Models
 # -------------------------
@@ -291,6 +745,8 @@ def check_service_availability():
 class CatalogRequest(BaseModel):
     """Request to generate a database catalog."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     db_connection_string: str = Field(
         ..., description="Readonly database connection string"
     )
@@ -312,6 +768,8 @@ class CatalogResponse(BaseModel):
 class CommentRequest(BaseModel):
     """Request to add a comment to a catalog."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     prefix: str = Field(..., description="S3 prefix (e.g., 'customer-123/orders')")
     timestamp: str = Field(..., description="Timestamp of catalog to comment on")
     user: str = Field(..., description="Username of commenter")
@@ -332,13 +790,13 @@ class CommentResponse(BaseModel):
 
 
 @app.get("/healthz", tags=["health"])
-def healthz():
+async def healthz():
     return {"status": "ok"}
 
 
 @app.get("/whoami", tags=["auth"])
-def whoami(claims: Dict = Depends(require_claims)):
-    return {"claims": claims}
+async def whoami(claims: Claims = Depends(require_claims)):
+    return {"claims": claims.payload}
 
 
 @app.get("/", response_class=HTMLResponse, tags=["ui"])
@@ -355,21 +813,20 @@ async def database_timelapse(request: Request, prefix: str):
         raise HTTPException(status_code=503, detail="S3 storage not initialized")
 
     # Get all timestamps
-    timestamps = s3_storage.list_timestamps(prefix, limit=50)
+    timestamps = await asyncio.to_thread(s3_storage.list_timestamps, prefix, limit=50)
     if not timestamps:
         return templates.TemplateResponse(
             "error.html",
             {"request": request, "message": f"No catalogs found for prefix: {prefix}"},
         )
 
-    # Get files for each timestamp
-    catalog_runs = []
-    for ts in timestamps:
-        files = s3_storage.list_all_files(prefix, ts)
-        catalog_runs.append({
-            "timestamp": ts,
-            "files": files,
-        })
+    # Get files for each timestamp, listing all of them concurrently
+    file_lists = await asyncio.gather(
+        *(asyncio.to_thread(s3_storage.list_all_files, prefix, ts) for ts in timestamps)
+    )
+    catalog_runs = [
+        {"timestamp": ts, "files": files} for ts, files in zip(timestamps, file_lists)
+    ]
 
     return templates.TemplateResponse(
         "timelapse.html",
@@ -385,12 +842,17 @@ async def view_catalog_comments(request: Request, prefix: str, timestamp: str):
         raise HTTPException(status_code=503, detail="S3 storage not initialized")
 
     # Get all comments for this timestamp
-    comment_list = s3_storage.list_comments(prefix, timestamp)
+    comment_list = await asyncio.to_thread(s3_storage.list_comments, prefix, timestamp)
 
-    # Read all comment contents
+    # Read all comment contents concurrently
+    contents = await asyncio.gather(
+        *(
+            asyncio.to_thread(s3_storage.read_comment, prefix, timestamp, info["filename"])
+            for info in comment_list
+        )
+    )
     comments = []
-    for comment_info in comment_list:
-        content = s3_storage.read_comment(prefix, timestamp, comment_info["filename"])
+    for comment_info, content in zip(comment_list, contents):
         if content:
             comments.append({
                 "user": comment_info["user"],
@@ -409,6 +871,62 @@ async def view_catalog_comments(request: Request, prefix: str, timestamp: str):
     )
 
 
+# Page wrapper for viewing a catalog's Python scripts
+SCRIPT_VIEW_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html>
+<head>
+    <title>$filename</title>
+    <style>
+        body {
+            font-family: monospace;
+            padding: 2rem;
+            background: #1e1e1e;
+            color: #d4d4d4;
+            margin: 0;
+        }
+        pre {
+            background: #1e1e1e;
+            padding: 1rem;
+            border-radius: 4px;
+            overflow-x: auto;
+            white-space: pre-wrap;
+            word-wrap: break-word;
+        }
+        h1 {
+            color: #569cd6;
+            border-bottom: 2px solid #569cd6;
+            padding-bottom: 0.5rem;
+        }
+    </style>
+</head>
+<body>
+    <h1>📄 $filename</h1>
+    <pre>$content</pre>
+</body>
+</html>
+""")
+
+
+# Read size for S3 objects streamed to the client
+S3_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _stream_body(body) -> Iterator[bytes]:
+    """Yield an S3 object body in chunks, closing it once done."""
+    try:
+        yield from body.iter_chunks(S3_STREAM_CHUNK_BYTES)
+    finally:
+        body.close()
+
+
+def _stream_text(body) -> Iterator[str]:
+    """Yield an S3 object body as UTF-8 text, decoding chunk by chunk."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in _stream_body(body):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
 @app.get("/api/catalog/view", response_class=HTMLResponse, tags=["api"])
 async def view_catalog_file(prefix: str, timestamp: str, filename: str):
     """View a catalog file (HTML or script) directly."""
@@ -419,47 +937,16 @@ async def view_catalog_file(prefix: str, timestamp: str, filename: str):
     try:
         # Try reading as HTML first
         if filename.endswith('.html'):
-            content = s3_storage.read_html(prefix, timestamp, filename)
-            return HTMLResponse(content=content)
+            body = await asyncio.to_thread(s3_storage.open_html, prefix, timestamp, filename)
+            return StreamingResponse(_stream_body(body), media_type="text/html")
         elif filename.endswith('.py'):
-            content = s3_storage.read_script(prefix, timestamp, filename)
+            content = await asyncio.to_thread(s3_storage.read_script, prefix, timestamp, filename)
             if content is None:
                 raise HTTPException(status_code=404, detail=f"Script not found: {filename}")
-            # Return Python code as HTML with syntax highlighting
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>{filename}</title>
-                <style>
-                    body {{
-                        font-family: monospace;
-                        padding: 2rem;
-                        background: #1e1e1e;
-                        color: #d4d4d4;
-                        margin: 0;
-                    }}
-                    pre {{
-                        background: #1e1e1e;
-                        padding: 1rem;
-                        border-radius: 4px;
-                        overflow-x: auto;
-                        white-space: pre-wrap;
-                        word-wrap: break-word;
-                    }}
-                    h1 {{
-                        color: #569cd6;
-                        border-bottom: 2px solid #569cd6;
-                        padding-bottom: 0.5rem;
-                    }}
-                </style>
-            </head>
-            <body>
-                <h1>📄 {filename}</h1>
-                <pre>{content}</pre>
-            </body>
-            </html>
-            """
+            # Return Python code as an HTML page, escaped so it renders as text
+            html_content = SCRIPT_VIEW_TEMPLATE.substitute(
+                filename=html.escape(filename), content=html.escape(content)
+            )
             return HTMLResponse(content=html_content)
         else:
             raise HTTPException(status_code=400, detail=f"Unsupported file type: {filename}")
@@ -477,35 +964,83 @@ async def get_catalog_content(
         raise HTTPException(status_code=503, detail="S3 storage not initialized")
 
     try:
-        content = s3_storage.read_html(prefix, timestamp, filename)
-        # Return HTML fragment
-        return templates.TemplateResponse(
-            "catalog_content_fragment.html",
-            {"request": request, "content": content, "filename": filename},
+        body = await asyncio.to_thread(s3_storage.open_html, prefix, timestamp, filename)
+        # Return HTML fragment, rendered as the catalog streams in from S3
+        template = templates.get_template("catalog_content_fragment.html")
+        return StreamingResponse(
+            template.generate(request=request, content=_stream_text(body), filename=filename),
+            media_type="text/html",
         )
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
-@app.get("/api/catalog/list", tags=["api"])
+# The catalog list fragment is a flat list of buttons, so it's assembled with
+# string formatting rather than a template render
+CATALOG_LIST_TEMPLATE = string.Template("""<div class="catalog-files">
+$items
+</div>
+
+<style>
+.catalog-files {
+    display: flex;
+    flex-direction: column;
+    gap: 0.5rem;
+    margin-bottom: 2rem;
+}
+
+.catalog-file {
+    padding: 1rem;
+    background: var(--background);
+    border: 1px solid var(--border);
+    border-radius: var(--radius);
+    text-align: left;
+    cursor: pointer;
+    transition: all 0.2s;
+}
+
+.catalog-file:hover {
+    border-color: var(--primary);
+}
+
+.catalog-file.active {
+    background: var(--primary);
+    color: white;
+    border-color: var(--primary);
+}
+</style>
+""")
+
+
+def _render_catalog_list(prefix: str, timestamp: str, catalogs: list[dict]) -> str:
+    """Render the catalog file buttons, escaping values as the templates do."""
+    if not catalogs:
+        items = '    <p class="hint">No catalog files found for this timestamp</p>'
+    else:
+        prefix = html.escape(prefix)
+        timestamp = html.escape(timestamp)
+        items = "\n".join(
+            f"""    <button
+        class="catalog-file{' active' if i == 0 else ''}"
+        onclick="loadCatalog('{prefix}', '{timestamp}', '{filename}', this)">
+        📄 {filename}
+    </button>"""
+            for i, filename in enumerate(html.escape(c["filename"]) for c in catalogs)
+        )
+    return CATALOG_LIST_TEMPLATE.substitute(items=items)
+
+
+@app.get("/api/catalog/list", response_class=HTMLResponse, tags=["api"])
 async def list_catalog_files(prefix: str, timestamp: str, request: Request):
     """List all catalog files for a specific timestamp."""
     if not s3_storage:
         check_service_availability()
         raise HTTPException(status_code=503, detail="S3 storage not initialized")
 
-    catalogs = s3_storage.list_catalogs(prefix, timestamp)
+    catalogs = await asyncio.to_thread(s3_storage.list_catalogs, prefix, timestamp)
 
     # Return HTML fragment for htmx
-    return templates.TemplateResponse(
-        "catalog_list_fragment.html",
-        {
-            "request": request,
-            "prefix": prefix,
-            "timestamp": timestamp,
-            "catalogs": catalogs,
-        },
-    )
+    return HTMLResponse(content=_render_catalog_list(prefix, timestamp, catalogs))
 
 
 @app.get("/api/catalog/recent", response_class=HTMLResponse, tags=["api"])
@@ -515,32 +1050,81 @@ async def list_recent_catalogs(request: Request, limit: int = 10):
         check_service_availability()
         raise HTTPException(status_code=503, detail="S3 storage not initialized")
 
-    # Get all prefixes
-    prefixes = s3_storage.list_prefixes(limit=50)
-
-    # Get latest timestamp for each prefix
-    recent_catalogs = []
-    for prefix in prefixes:
-        timestamps = s3_storage.list_timestamps(prefix, limit=1)
-        if timestamps:
-            recent_catalogs.append({
-                "prefix": prefix,
-                "timestamp": timestamps[0],
-            })
+    # Latest catalog for each prefix, possibly slightly stale
+    recent_catalogs = await get_recent_catalogs()
 
-    # Sort by timestamp (newest first)
-    recent_catalogs.sort(key=lambda x: x["timestamp"], reverse=True)
+    # Newest first; only the first `limit` are shown, so don't sort the rest
+    recent_catalogs = heapq.nlargest(limit, recent_catalogs, key=lambda x: x["timestamp"])
 
     # Return HTML fragment for htmx
     return templates.TemplateResponse(
         "recent_catalogs_fragment.html",
         {
             "request": request,
-            "catalogs": recent_catalogs[:limit],
+            "catalogs": recent_catalogs,
         },
     )
 
 
+# Rendered context documents keyed by (prefix, timestamp, strip_tags). A run's
+# files don't change once written, but comments can be added to it, so entries
+# are only served for CONTEXT_CACHE_TTL seconds (0 disables the cache, as with
+# several WORKERS). Only touched from the event loop, so no lock is needed.
+CONTEXT_CACHE_TTL = float(os.getenv("CONTEXT_CACHE_TTL", "60")) if WORKERS == 1 else 0.0
+CONTEXT_CACHE_SIZE = 512
+_context_cache: dict[tuple[str, str, bool], tuple[float, str]] = {}
+
+
+def _get_cached_context(key: tuple[str, str | None, bool]) -> str | None:
+    entry = _context_cache.get(key)
+    if entry is None:
+        return None
+    fetched_at, content = entry
+    if time.monotonic() - fetched_at > CONTEXT_CACHE_TTL:
+        del _context_cache[key]
+        return None
+    return content
+
+
+def _cache_context(key: tuple[str, str, bool], content: str) -> None:
+    if CONTEXT_CACHE_TTL <= 0:
+        return
+    if len(_context_cache) >= CONTEXT_CACHE_SIZE:
+        # Evict the oldest entry
+        del _context_cache[next(iter(_context_cache))]
+    _context_cache[key] = (time.monotonic(), content)
+
+
+async def _stream_and_cache_context(
+    key: tuple[str, str | None, bool], pieces: Iterator[str]
+) -> AsyncIterator[str]:
+    """Stream a context document, caching it once it has been sent in full.
+
+    The status line has already gone out by the time most of the document is
+    read, so a failure part-way through can't become a 500. It is logged here
+    instead, and the document is closed with an error note and not cached.
+    """
+    parts = []
+    try:
+        async for piece in iterate_in_threadpool(pieces):
+            parts.append(piece)
+            yield piece
+    except Exception as e:
+        log.error("catalog.context.error", error=str(e), prefix=key[0], exc_info=True)
+        yield (
+            '\n<p class="error">Failed to load the rest of the context summary: '
+            f"{html.escape(str(e))}</p>\n</body>\n</html>"
+        )
+        return
+    if key[1] is not None:
+        _cache_context(key, "".join(parts))
+
+
+def _invalidate_context(prefix: str, timestamp: str) -> None:
+    for strip_tags in (False, True):
+        _context_cache.pop((prefix, timestamp, strip_tags), None)
+
+
 @app.get("/catalog/context", response_class=HTMLResponse, tags=["catalog"])
 async def get_catalog_context(
     prefix: str, timestamp: str | None = None, strip_tags: bool = False
@@ -566,14 +1150,33 @@ async def get_catalog_context(
         raise HTTPException(status_code=503, detail="S3 storage not initialized")
 
     try:
-        context_html = generate_context_summary(s3_storage, prefix, timestamp)
+        # Resolve "latest" first so the cache key names a concrete run
+        if timestamp is None:
+            timestamps = await asyncio.to_thread(s3_storage.list_timestamps, prefix, limit=1)
+            timestamp = timestamps[0] if timestamps else None
+
+        cache_key = (prefix, timestamp, strip_tags)
+        content = _get_cached_context(cache_key)
+        if content is not None:
+            return HTMLResponse(content=content)
 
-        if strip_tags:
-            # Return plain text for token efficiency
-            context_text = strip_html_tags(context_html)
-            return HTMLResponse(content=f"<pre>{context_text}</pre>")
-        else:
-            return HTMLResponse(content=context_html)
+        if not strip_tags:
+            # Send the document as it's assembled, starting with its header
+            pieces = iter_context_summary(s3_storage, prefix, timestamp)
+            return StreamingResponse(
+                _stream_and_cache_context(cache_key, pieces), media_type="text/html"
+            )
+
+        # Return plain text for token efficiency (off the event loop; the
+        # summary can be large)
+        content = await asyncio.to_thread(
+            generate_context_summary, s3_storage, prefix, timestamp
+        )
+        text = await asyncio.to_thread(strip_html_tags, content)
+        content = f"<pre>{text}</pre>"
+        if timestamp is not None:
+            _cache_context(cache_key, content)
+        return HTMLResponse(content=content)
     except Exception as e:
         log.error("catalog.context.error", error=str(e), exc_info=True)
         raise HTTPException(
@@ -581,11 +1184,13 @@ async def get_catalog_context(
         )
 
 
-@app.post("/catalog/comment", tags=["catalog"], response_model=CommentResponse)
-def add_catalog_comment(
-    request: CommentRequest,
-    claims: Dict = Depends(require_claims),
-):
+@app.post(
+    "/catalog/comment",
+    tags=["catalog"],
+    response_model=CommentResponse,
+    openapi_extra=BEARER_AUTH_DOC,
+)
+async def add_catalog_comment(request: CommentRequest, http_request: Request):
     """Add a comment to a catalog.
 
     Comments are stored in S3 alongside the catalog results at:
@@ -593,6 +1198,7 @@ def add_catalog_comment(
 
     This allows human feedback to be included in future catalog contexts.
     """
+    claims: Claims = http_request.state.claims
     if not s3_storage:
         check_service_availability()
         raise HTTPException(
@@ -602,20 +1208,24 @@ def add_catalog_comment(
 
     log.info(
         "catalog.comment",
-        user=claims.get("sub"),
+        user=claims.sub,
         prefix=request.prefix,
         timestamp=request.timestamp,
         comment_user=request.user,
     )
 
     try:
-        uri = s3_storage.write_comment(
+        uri = await asyncio.to_thread(
+            s3_storage.write_comment,
             prefix=request.prefix,
             timestamp=request.timestamp,
             user=request.user,
             comment=request.comment,
         )
 
+        # The run's context now includes this comment
+        _invalidate_context(request.prefix, request.timestamp)
+
         log.info("catalog.comment.complete", uri=uri)
         return CommentResponse(
             uri=uri,
@@ -631,11 +1241,10 @@ def add_catalog_comment(
         )
 
 
-@app.post("/catalog", tags=["catalog"], response_model=CatalogResponse)
-def create_catalog(
-    request: CatalogRequest,
-    claims: Dict = Depends(require_claims),
-):
+@app.post(
+    "/catalog", tags=["catalog"], response_model=CatalogResponse, openapi_extra=BEARER_AUTH_DOC
+)
+async def create_catalog(request: CatalogRequest, http_request: Request):
     """Generate a database catalog.
 
     This endpoint triggers an asynchronous workflow that:
@@ -647,10 +1256,14 @@ def create_catalog(
 
     Returns S3 URIs for both HTML reports.
     """
-    # Check if workflow is available
-    if catalog_workflow is None:
+    claims: Claims = http_request.state.claims
+    # Build the workflow on first use; docker or S3 being unavailable is a 503
+    try:
+        workflow = await to_thread.run_sync(get_catalog_workflow)
+    except Exception as e:
         # Log detailed service availability info
         check_service_availability()
+        log.error("catalog.workflow_unavailable", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Catalog workflow not initialized",
@@ -658,16 +1271,21 @@ def create_catalog(
 
     log.info(
         "catalog.request",
-        user=claims.get("sub"),
+        user=claims.sub,
         tables=request.tables,
         s3_prefix=request.s3_prefix,
     )
 
     try:
-        result = catalog_workflow.run(
-            db_connection_string=request.db_connection_string,
-            tables=request.tables,
-            s3_prefix=request.s3_prefix,
+        # The workflow blocks on containers and the LLM for its whole run; use
+        # anyio's threadpool so MAX_WORKFLOW_THREADS bounds concurrent runs
+        result = await to_thread.run_sync(
+            functools.partial(
+                workflow.run,
+                db_connection_string=request.db_connection_string,
+                tables=request.tables,
+                s3_prefix=request.s3_prefix,
+            )
         )
 
         log.info("catalog.complete", result=result)
@@ -687,13 +1305,21 @@ if __name__ == "__main__":
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
     reload = os.getenv("RELOAD", "false").lower() == "true"
+    # Worker processes each hold their own caches and S3 client
+    workers = WORKERS
 
-    log.info("launcher.starting", reload=reload)
+    log.info("launcher.starting", reload=reload, workers=workers)
     uvicorn.run(
-        "server.main:app" if reload else app,
+        # reload and multiple workers need an import string to spawn processes
+        "server.main:app" if reload or workers > 1 else app,
         host=host,
         port=port,
         reload=reload,
+        workers=workers,
         reload_dirs=["./server", "./src"] if reload else None,
         log_level="info",
+        # Both ship with uvicorn[standard]; name them so a missing one fails
+        # at startup instead of silently falling back to asyncio/h11
+        loop="uvloop",
+        http="httptools",
     )
@@ -1,9 +1,11 @@
 """Core agent loop implementation."""
 
-import json
+import hashlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
 import anthropic
+import orjson
 import structlog
 
 from ..container.runtime import ContainerRuntime, ExecutionError
@@ -11,6 +13,11 @@ from .tools import get_tool_schemas
 
 log = structlog.get_logger()
 
+# Once a request's prompt passes compaction_threshold tokens, tool results
+# longer than this many characters are elided, except in the newest messages
+COMPACT_RESULT_CHARS = 2000
+COMPACT_KEEP_MESSAGES = 4
+
 
 class AgentTerminated(Exception):
     """Raised when the agent calls submit_html."""
@@ -34,14 +41,20 @@ class AgentLoop:
         model: str = "claude-sonnet-4-0",
         max_tokens: int = 100_000,
         temperature: float = 0.0,
+        compaction_threshold: int = 40_000,
     ):
         self.client = client
         self.runtime = runtime
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.compaction_threshold = compaction_threshold
         self.tools = get_tool_schemas()
-        self._token_usage = {"input": 0, "output": 0}
+        self._token_usage = {"input": 0, "output": 0, "cache_read": 0, "cache_creation": 0}
+        # Prompt size of the latest request, cached or not
+        self._prompt_tokens = 0
+        # Conversation block currently carrying the rolling cache breakpoint
+        self._cache_breakpoint: dict[str, Any] | None = None
 
     def run(self, system_prompt: str, context: dict[str, Any]) -> str:
         """Run the agent loop until it submits HTML.
@@ -56,14 +69,32 @@ class AgentLoop:
         Raises:
             RuntimeError: If agent exceeds token budget or max iterations
         """
-        # Initialize conversation with context
+        # Initialize conversation with context. The context turn never changes
+        # during a run, so it is serialized deterministically and cached along
+        # with the system prompt.
+        context_json = orjson.dumps(
+            context,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        ).decode()
         messages = [
             {
                 "role": "user",
-                "content": f"Context:\n```json\n{json.dumps(context, indent=2)}\n```\n\nBegin your analysis.",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Context:\n```json\n{context_json}\n```\n\nBegin your analysis.",
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
             }
         ]
 
+        # Cache the tools + system prompt prefix; tools come before the system
+        # prompt in the cache order, so this one breakpoint covers both
+        system = [
+            {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+        ]
+
         iteration = 0
         max_iterations = 50  # Safety limit
 
@@ -73,114 +104,84 @@ class AgentLoop:
             context_keys=list(context.keys()),
         )
 
+        # Tool calls run on a single worker thread: in order, since they share one
+        # persistent Python session, but overlapping with the rest of the response
+        # still being generated. Leaving the block waits for any call in flight.
         try:
-            while iteration < max_iterations:
-                iteration += 1
-
-                # Call Claude API
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=8192,  # Per-request limit (increased for HTML generation)
-                    temperature=self.temperature,
-                    system=system_prompt,
-                    messages=messages,
-                    tools=self.tools,
-                )
-
-                # Track token usage
-                self._token_usage["input"] += response.usage.input_tokens
-                self._token_usage["output"] += response.usage.output_tokens
-
-                log.info(
-                    "agent.loop.iteration",
-                    iteration=iteration,
-                    stop_reason=response.stop_reason,
-                    input_tokens=response.usage.input_tokens,
-                    output_tokens=response.usage.output_tokens,
-                    total_input=self._token_usage["input"],
-                    total_output=self._token_usage["output"],
-                )
-
-                # Check token budget
-                if self._token_usage["output"] > self.max_tokens:
-                    raise RuntimeError(
-                        f"Agent exceeded token budget: {self._token_usage['output']} > {self.max_tokens}"
-                    )
-
-                # Add assistant message
-                messages.append({"role": "assistant", "content": response.content})
-
-                # Handle stop reason
-                if response.stop_reason == "end_turn":
-                    # Agent finished without tool use (shouldn't happen)
-                    raise RuntimeError("Agent ended conversation without submitting HTML")
-
-                if response.stop_reason == "tool_use":
-                    # Process tool calls
-                    tool_results = []
-
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                while iteration < max_iterations:
+                    iteration += 1
+
+                    try:
+                        response, tool_calls = self._stream_response(
+                            system, messages, executor, iteration
+                        )
+                    except AgentTerminated as e:
+                        # Agent submitted HTML - return it
+                        log.info(
+                            "agent.loop.complete",
+                            iterations=iteration,
+                            tokens=self._token_usage,
+                        )
+                        return e.html_content
+
+                    # Check token budget
+                    if self._token_usage["output"] > self.max_tokens:
+                        raise RuntimeError(
+                            "Agent exceeded token budget: "
+                            f"{self._token_usage['output']} > {self.max_tokens}"
+                        )
+
+                    # Add assistant message
+                    messages.append({"role": "assistant", "content": response.content})
+
+                    # Handle stop reason
+                    if response.stop_reason == "end_turn":
+                        # Agent finished without tool use (shouldn't happen)
+                        raise RuntimeError("Agent ended conversation without submitting HTML")
+
+                    if response.stop_reason not in ("tool_use", "max_tokens"):
+                        raise RuntimeError(f"Unexpected stop reason: {response.stop_reason}")
+
+                    if response.stop_reason == "max_tokens":
+                        # Hit per-request token limit; tool calls can still be
+                        # complete even if text content was cut off
+                        log.warning("agent.loop.max_tokens_per_request", iteration=iteration)
+
+                    # Dispatch any tool call whose block never finished streaming
                     for block in response.content:
-                        if block.type == "tool_use":
-                            try:
-                                result = self._handle_tool_call(block)
-                                tool_results.append(
-                                    {
-                                        "type": "tool_result",
-                                        "tool_use_id": block.id,
-                                        "content": result,
-                                    }
-                                )
-                            except AgentTerminated as e:
-                                # Agent submitted HTML - return it
-                                log.info(
-                                    "agent.loop.complete",
-                                    iterations=iteration,
-                                    tokens=self._token_usage,
-                                )
-                                return e.html_content
-
-                    # Add tool results to conversation
-                    messages.append({"role": "user", "content": tool_results})
-
-                elif response.stop_reason == "max_tokens":
-                    # Hit per-request token limit
-                    log.warning("agent.loop.max_tokens_per_request", iteration=iteration)
+                        if block.type == "tool_use" and block.id not in tool_calls:
+                            tool_calls[block.id] = executor.submit(self._handle_tool_call, block)
 
-                    # Check if there are any tool calls in the truncated response
-                    # (tool calls can be complete even if text content was cut off)
                     tool_results = []
-                    has_tool_calls = False
+                    for tool_use_id, future in tool_calls.items():
+                        try:
+                            result = future.result()
+                        except AgentTerminated as e:
+                            log.info(
+                                "agent.loop.complete",
+                                iterations=iteration,
+                                tokens=self._token_usage,
+                            )
+                            return e.html_content
+                        tool_results.append(
+                            {
+                                "type": "tool_result",
+                                "tool_use_id": tool_use_id,
+                                "content": result,
+                            }
+                        )
 
-                    for block in response.content:
-                        if block.type == "tool_use":
-                            has_tool_calls = True
-                            try:
-                                result = self._handle_tool_call(block)
-                                tool_results.append(
-                                    {
-                                        "type": "tool_result",
-                                        "tool_use_id": block.id,
-                                        "content": result,
-                                    }
-                                )
-                            except AgentTerminated as e:
-                                # Agent submitted HTML - return it
-                                log.info(
-                                    "agent.loop.complete",
-                                    iterations=iteration,
-                                    tokens=self._token_usage,
-                                )
-                                return e.html_content
-
-                    # If there were tool calls, add results to conversation
-                    if has_tool_calls:
+                    # Add tool results to conversation
+                    # (pure text truncated by max_tokens has none; just continue)
+                    if tool_results:
+                        self._move_cache_breakpoint(tool_results)
                         messages.append({"role": "user", "content": tool_results})
-                    # Otherwise just continue (pure text was truncated)
 
-                else:
-                    raise RuntimeError(f"Unexpected stop reason: {response.stop_reason}")
+                    if self._prompt_tokens > self.compaction_threshold:
+                        self._compact_history(messages)
 
-            raise RuntimeError(f"Agent exceeded max iterations: {max_iterations}")
+                raise RuntimeError(f"Agent exceeded max iterations: {max_iterations}")
 
         except Exception as e:
             log.error(
@@ -191,6 +192,120 @@ class AgentLoop:
             )
             raise
 
+    def _stream_response(
+        self,
+        system: list[dict[str, Any]],
+        messages: list[dict[str, Any]],
+        executor: ThreadPoolExecutor,
+        iteration: int,
+    ) -> tuple[Any, dict[str, Future[str]]]:
+        """Stream one model response, starting each tool call as soon as its block is complete.
+
+        Returns:
+            The final message and the dispatched tool calls keyed by tool_use id,
+            in the order they appear in the response
+
+        Raises:
+            AgentTerminated: If the response contains a complete submit_html call;
+                the rest of the response is not generated
+        """
+        tool_calls: dict[str, Future[str]] = {}
+
+        with self.client.messages.stream(
+            model=self.model,
+            max_tokens=8192,  # Per-request limit (increased for HTML generation)
+            temperature=self.temperature,
+            system=system,
+            messages=messages,
+            tools=self.tools,
+        ) as stream:
+            for event in stream:
+                if event.type != "content_block_stop" or event.content_block.type != "tool_use":
+                    continue
+                block = event.content_block
+                future = executor.submit(self._handle_tool_call, block)
+                tool_calls[block.id] = future
+
+                if block.name == "submit_html":
+                    try:
+                        future.result()
+                    except AgentTerminated:
+                        self._record_usage(stream.current_message_snapshot, iteration)
+                        raise
+
+            response = stream.get_final_message()
+
+        self._record_usage(response, iteration)
+        return response, tool_calls
+
+    def _record_usage(self, message: Any, iteration: int) -> None:
+        """Add a response's token usage to the run totals and log it."""
+        cache_read = message.usage.cache_read_input_tokens or 0
+        cache_creation = message.usage.cache_creation_input_tokens or 0
+        self._token_usage["input"] += message.usage.input_tokens
+        self._token_usage["output"] += message.usage.output_tokens
+        self._token_usage["cache_read"] += cache_read
+        self._token_usage["cache_creation"] += cache_creation
+        self._prompt_tokens = message.usage.input_tokens + cache_read + cache_creation
+
+        log.info(
+            "agent.loop.iteration",
+            iteration=iteration,
+            stop_reason=message.stop_reason,
+            input_tokens=message.usage.input_tokens,
+            output_tokens=message.usage.output_tokens,
+            cache_read_input_tokens=cache_read,
+            cache_creation_input_tokens=cache_creation,
+            total_input=self._token_usage["input"],
+            total_output=self._token_usage["output"],
+        )
+
+    def _compact_history(self, messages: list[dict[str, Any]]) -> None:
+        """Replace long tool results outside the newest messages with a short marker.
+
+        The first message (the context) and the last COMPACT_KEEP_MESSAGES are
+        kept verbatim. Results that were already elided are left alone, so the
+        prompt prefix only changes when there is something new to drop.
+        """
+        elided = 0
+        for message in messages[1:-COMPACT_KEEP_MESSAGES]:
+            if message["role"] != "user" or not isinstance(message["content"], list):
+                continue
+            for block in message["content"]:
+                content = block.get("content")
+                if (
+                    block.get("type") != "tool_result"
+                    or not isinstance(content, str)
+                    or len(content) <= COMPACT_RESULT_CHARS
+                ):
+                    continue
+                sha = hashlib.sha256(content.encode()).hexdigest()
+                block["content"] = (
+                    f"[elided: {len(content)} chars, sha={sha[:8]}; "
+                    "re-run the code if you need this output]"
+                )
+                elided += 1
+
+        if elided:
+            log.info(
+                "agent.loop.compacted",
+                elided_results=elided,
+                prompt_tokens=self._prompt_tokens,
+            )
+
+    def _move_cache_breakpoint(self, tool_results: list[dict[str, Any]]) -> None:
+        """Mark the newest tool result as the end of the cached prefix.
+
+        Each request then reads the whole conversation so far from the prompt
+        cache. The previous marker is removed so the request stays within the
+        API's limit of four cache breakpoints (this one plus the system prompt
+        and the context turn).
+        """
+        if self._cache_breakpoint is not None:
+            self._cache_breakpoint.pop("cache_control", None)
+        self._cache_breakpoint = tool_results[-1]
+        self._cache_breakpoint["cache_control"] = {"type": "ephemeral"}
+
     def _handle_tool_call(self, tool_use: Any) -> str:
         """Handle a single tool call.
 
@@ -7,7 +7,9 @@ Following Armin Ronacher's "Tools" pattern, we provide just two tools:
 
 from typing import Any
 
-TOOL_SCHEMAS = [
+# Shared by every agent loop and sent unchanged with each request, so it is
+# never mutated; the tuple keeps callers from adding or removing tools
+TOOL_SCHEMAS: tuple[dict[str, Any], ...] = (
     {
         "name": "execute_python",
         "description": (
@@ -46,9 +48,9 @@ TOOL_SCHEMAS = [
             "required": ["content"],
         },
     },
-]
+)
 
 
-def get_tool_schemas() -> list[dict[str, Any]]:
-    """Return the tool schemas for the agent."""
+def get_tool_schemas() -> tuple[dict[str, Any], ...]:
+    """Return the tool schemas for the agent (shared; do not mutate)."""
     return TOOL_SCHEMAS
@@ -1,16 +1,20 @@
 """CLI for cataloger."""
 
 import base64
+import functools
 import os
+import re
 import shutil
 import sys
 from pathlib import Path
 
 import click
-import yaml
 
 CONTEXT_SETTINGS = {"help_option_names": ["-h", "--help"]}
 
+# Encoded prompt lines in .env.server
+PROMPT_LINE_RE = re.compile(r"^(CATALOGING_AGENT_PROMPT|SUMMARY_AGENT_PROMPT)=.*$", re.MULTILINE)
+
 
 @click.group(context_settings=CONTEXT_SETTINGS)
 def cli() -> None:
@@ -44,9 +48,12 @@ def setup_env() -> None:
     """Setup environment configuration for Cataloger.
 
     Idempotent command that creates/updates .env.server with encoded prompts.
-    Safe to run multiple times - will always update prompts to latest version.
+    Safe to run multiple times - updates prompts to the latest version and
+    leaves the file untouched when they are already current.
 
     """
+    import yaml
+
     # Check if prompts exist
     prompts_dir = Path("prompts")
     cataloging_prompt_file = prompts_dir / "cataloging_agent.yaml"
@@ -76,36 +83,38 @@ def setup_env() -> None:
 
     # Determine if we're creating new or updating existing
     if env_file.exists():
-        click.echo("✓ Updating existing .env.server")
 
-        # Read existing file
-        with open(env_file) as f:
-            lines = f.readlines()
-
-        # Update prompt lines, preserve everything else
-        updated = []
-        cataloging_updated = False
-        summary_updated = False
-
-        for line in lines:
-            if line.startswith("CATALOGING_AGENT_PROMPT="):
-                updated.append(f'CATALOGING_AGENT_PROMPT="{cataloging_encoded}"\n')
-                cataloging_updated = True
-            elif line.startswith("SUMMARY_AGENT_PROMPT="):
-                updated.append(f'SUMMARY_AGENT_PROMPT="{summary_encoded}"\n')
-                summary_updated = True
-            else:
-                updated.append(line)
+        # Update prompt lines in one pass, preserve everything else
+        text = env_file.read_text()
+        values = {
+            "CATALOGING_AGENT_PROMPT": cataloging_encoded,
+            "SUMMARY_AGENT_PROMPT": summary_encoded,
+        }
+        seen = set()
+
+        def replace_prompt(match: re.Match[str]) -> str:
+            key = match.group(1)
+            seen.add(key)
+            return f'{key}="{values[key]}"'
+
+        updated = PROMPT_LINE_RE.sub(replace_prompt, text)
 
         # If prompts weren't in file, append them
-        if not cataloging_updated:
-            updated.append(f'CATALOGING_AGENT_PROMPT="{cataloging_encoded}"\n')
-        if not summary_updated:
-            updated.append(f'SUMMARY_AGENT_PROMPT="{summary_encoded}"\n')
+        missing = [key for key in values if key not in seen]
+        if missing:
+            if updated and not updated.endswith("\n"):
+                updated += "\n"
+            updated += "".join(f'{key}="{values[key]}"\n' for key in missing)
+
+        # Leave the file (and its mtime) alone when nothing changed, so
+        # watchers don't reload for a no-op run
+        if updated == text:
+            click.echo("✓ Prompts already up to date")
+            return
 
         # Write back
-        with open(env_file, "w") as f:
-            f.writelines(updated)
+        click.echo("✓ Updating existing .env.server")
+        env_file.write_text(updated)
 
         click.echo("✓ Prompts updated in .env.server")
 
@@ -182,8 +191,6 @@ def catalog(
           --table users --table orders --table products \\
           --s3-prefix "customer-123/prod"
     """
-    import requests
-
     api_url = api_url or os.getenv("CATALOGER_API_URL")
     token = token or os.getenv("CATALOGER_AUTH_TOKEN")
 
@@ -203,7 +210,7 @@ def catalog(
     table_list = list(table)
 
     # Make request
-    response = requests.post(
+    response = _make_session().post(
         f"{api_url}/catalog",
         headers={"Authorization": f"Bearer {token}"},
         json={
@@ -211,6 +218,8 @@ def catalog(
             "tables": table_list,
             "s3_prefix": s3_prefix,
         },
+        # Catalog runs can take minutes, so only the connect phase is bounded
+        timeout=(5, None),
     )
 
     if response.status_code == 200:
@@ -225,6 +234,34 @@ def catalog(
         sys.exit(1)
 
 
+@functools.lru_cache(maxsize=1)
+def _make_session():
+    """Return a shared HTTP session that keeps connections alive and retries.
+
+    Retries cover failed connections and 503s, which the API returns before
+    doing any work. Other gateway errors aren't retried because the catalog
+    run may already be in progress.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+
+    retry = Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=[503],
+        allowed_methods=["POST"],
+        # Hand the last 503 back to the caller instead of raising
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 @cli.command()
 @click.argument("secret", required=False)
 def generate_token(secret: str | None) -> None:
@@ -233,7 +270,7 @@ def generate_token(secret: str | None) -> None:
     Example:
         cataloger generate-token your-secret-key
     """
-    from jose import jwt
+    import jwt
 
     secret = secret or os.getenv("AUTH_SECRET", "change-me")
 
@@ -1,4 +1,8 @@
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from typing import Any, Iterator
 
@@ -16,6 +20,7 @@ class ContainerPool:
 
     This provides acquire/release semantics for containers, with each
     container maintaining state across multiple agent runs until released.
+    The pool is safe to use from multiple threads.
     """
 
     def __init__(
@@ -23,13 +28,16 @@ class ContainerPool:
         image_name: str = "cataloger-agent:latest",
         pool_size: int = 5,
         container_timeout: int = 300,
+        warmup: int = 0,
     ):
         """Initialize the container pool.
 
         Args:
             image_name: Docker image to use for containers
             pool_size: Maximum number of containers in the pool
-            container_timeout: Maximum lifetime for a container in seconds
+            container_timeout: Seconds an idle container may sit in the pool before
+                it is evicted
+            warmup: Number of containers to start (concurrently) before returning
         """
         self.image_name = image_name
         self.pool_size = pool_size
@@ -45,9 +53,18 @@ class ContainerPool:
                 f"Build it with: make build-container"
             )
 
-        # Pool of available containers
-        self._available: list[Container] = []
+        # Idle containers as (released_at, container), most recently released
+        # last; containers idle longer than container_timeout are evicted from
+        # the old end
+        self._available: deque[tuple[float, Container]] = deque()
         self._in_use: set[str] = set()
+        # Containers being created; they count against pool_size
+        self._starting = 0
+        # Guards _available, _in_use and _starting; docker calls happen outside it
+        self._lock = threading.Lock()
+
+        if warmup:
+            self.warm(warmup)
 
     def _create_container(self) -> Container:
         """Create a new container and start it."""
@@ -112,6 +129,61 @@ class ContainerPool:
 
         return container
 
+    def _pop_expired(self) -> list[Container]:
+        """Remove containers idle longer than container_timeout (lock held)."""
+        cutoff = time.monotonic() - self.container_timeout
+        expired = []
+        while self._available and self._available[0][0] < cutoff:
+            expired.append(self._available.popleft()[1])
+        return expired
+
+    def _remove_container(self, container: Container) -> None:
+        try:
+            container.stop(timeout=5)
+            container.remove()
+        except docker.errors.APIError:
+            pass
+
+    def _size(self) -> int:
+        return len(self._available) + len(self._in_use) + self._starting
+
+    def prewarm_one(self) -> bool:
+        """Start one container ahead of demand and make it available.
+
+        Returns:
+            True if a container was started, False if the pool is already full
+        """
+        with self._lock:
+            if self._size() >= self.pool_size:
+                return False
+            self._starting += 1
+
+        try:
+            container = self._create_container()
+        finally:
+            with self._lock:
+                self._starting -= 1
+        with self._lock:
+            self._available.append((time.monotonic(), container))
+        return True
+
+    def warm(self, count: int) -> int:
+        """Start up to `count` containers concurrently.
+
+        Containers boot in parallel, so warming the whole pool takes about as
+        long as starting one.
+
+        Returns:
+            Number of containers started
+        """
+        count = min(count, self.pool_size)
+        if count <= 0:
+            return 0
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            started = sum(executor.map(lambda _: self.prewarm_one(), range(count)))
+        logger.info("pool.warmed", started=started, pool_size=self.pool_size)
+        return started
+
     def acquire(
         self,
         db_connection_string: str | None = None,
@@ -126,62 +198,104 @@ class ContainerPool:
         Returns:
             ContainerRuntime instance ready for code execution
         """
-        # Try to get an available container
-        if self._available:
-            container = self._available.pop()
-            # Verify container is still running, restart if needed
-            container.reload()
-            if container.status != "running":
-                logger.warning(
-                    f"Container {container.short_id} is not running, restarting..."
-                )
-                container.restart()
-        # Or create a new one if under pool size
-        elif len(self._in_use) < self.pool_size:
-            container = self._create_container()
-        else:
+        # Take the most recently released container, or reserve a slot for a
+        # new one
+        container = None
+        exhausted = False
+        with self._lock:
+            expired = self._pop_expired()
+            if self._available:
+                _, container = self._available.pop()
+                self._in_use.add(container.id)
+            elif self._size() < self.pool_size:
+                self._starting += 1
+            else:
+                exhausted = True
+
+        for stale in expired:
+            self._remove_container(stale)
+        if exhausted:
             raise RuntimeError(f"Container pool exhausted (size={self.pool_size})")
 
-        self._in_use.add(container.id)
-        return ContainerRuntime(
-            container=container,
-            db_connection_string=db_connection_string,
-            s3_config=s3_config,
-        )
+        if container is None:
+            # Create a new one in the reserved slot
+            try:
+                container = self._create_container()
+            finally:
+                with self._lock:
+                    self._starting -= 1
+            with self._lock:
+                self._in_use.add(container.id)
+        else:
+            try:
+                # Verify container is still running, restart if needed
+                container.reload()
+                if container.status != "running":
+                    logger.warning(
+                        f"Container {container.short_id} is not running, restarting..."
+                    )
+                    container.restart()
+            except Exception:
+                self._discard(container)
+                raise
+
+        try:
+            return ContainerRuntime(
+                container=container,
+                db_connection_string=db_connection_string,
+                s3_config=s3_config,
+            )
+        except Exception:
+            self._discard(container)
+            raise
 
     def release(self, runtime: ContainerRuntime) -> None:
         """Release a container back to the pool.
 
-        The container is reset and made available for reuse.
+        The container is reset and made available for reuse. If the reset
+        fails, the container is removed instead so its slot is freed.
         """
         container_id = runtime.container.id
-        if container_id not in self._in_use:
-            raise ValueError(f"Container {container_id} not in use")
+        with self._lock:
+            if container_id not in self._in_use:
+                raise ValueError(f"Container {container_id} not in use")
+
+        try:
+            runtime.reset()
+        except Exception:
+            self._discard(runtime.container)
+            raise
+        with self._lock:
+            self._in_use.remove(container_id)
+            self._available.append((time.monotonic(), runtime.container))
 
-        self._in_use.remove(container_id)
-        runtime.reset()
-        self._available.append(runtime.container)
+    def _discard(self, container: Container) -> None:
+        """Free an in-use container's slot and remove the container."""
+        with self._lock:
+            self._in_use.discard(container.id)
+        self._remove_container(container)
 
     def cleanup(self) -> None:
         """Stop and remove all containers in the pool."""
+        with self._lock:
+            in_use = list(self._in_use)
+            available = [container for _, container in self._available]
+            self._available.clear()
+
         # Clean up in-use containers
-        for container_id in list(self._in_use):
+        for container_id in in_use:
             try:
                 container = self.client.containers.get(container_id)
                 container.stop(timeout=5)
                 container.remove()
             except docker.errors.NotFound:
                 pass
-            self._in_use.discard(container_id)
+            with self._lock:
+                self._in_use.discard(container_id)
 
         # Clean up available containers
-        for container in self._available:
-            try:
-                container.stop(timeout=5)
-                container.remove()
-            except docker.errors.APIError:
-                pass
-        self._available.clear()
+        for container in available:
+            self._remove_container(container)
 
     @contextmanager
     def get_runtime(
@@ -1,47 +1,45 @@
 """Context summary generation for agent context."""
 
-from html.parser import HTMLParser
+import re
+from html import unescape
+from typing import TYPE_CHECKING, Iterator
 
 import structlog
 
-from cataloger.storage.s3 import S3Storage
+if TYPE_CHECKING:
+    from cataloger.storage.s3 import S3Storage
 
 log = structlog.get_logger()
 
+# Files from a previous run that make up its context
+CONTEXT_FILES = (
+    "catalog.html",
+    "recent_summary.html",
+    "catalog_script.py",
+    "summary_script.py",
+)
 
-class HTMLStripper(HTMLParser):
-    """Strip HTML tags from text for token efficiency."""
 
-    def __init__(self):
-        super().__init__()
-        self.reset()
-        self.strict = False
-        self.convert_charrefs = True
-        self.text = []
-
-    def handle_data(self, data):
-        self.text.append(data)
-
-    def get_data(self):
-        return "".join(self.text)
+# Comments first so a ">" inside one doesn't end the match early
+_TAG_RE = re.compile(r"<!--.*?-->|<[^>]*>", re.DOTALL)
 
 
 def strip_html_tags(html: str) -> str:
     """Remove HTML tags from string, keeping only text content.
 
+    Character references are decoded, as an HTML parser would.
+
     Args:
         html: HTML string
 
     Returns:
         Plain text with tags removed
     """
-    stripper = HTMLStripper()
-    stripper.feed(html)
-    return stripper.get_data()
+    return unescape(_TAG_RE.sub("", html))
 
 
 def generate_context_summary(
-    storage: S3Storage,
+    storage: "S3Storage",
     prefix: str,
     timestamp: str | None = None,
 ) -> str:
@@ -61,33 +59,55 @@ def generate_context_summary(
     Returns:
         HTML summary document
     """
+    html = "".join(iter_context_summary(storage, prefix, timestamp))
+    log.info("context.generated", prefix=prefix, timestamp=timestamp, size=len(html))
+    return html
+
+
+def iter_context_summary(
+    storage: "S3Storage",
+    prefix: str,
+    timestamp: str | None = None,
+) -> Iterator[str]:
+    """Yield the context summary HTML piece by piece.
+
+    The document header is yielded before anything is read from S3, so a
+    streaming response can start right away, and each section follows as soon
+    as its files have been read. Joined, the pieces are exactly what
+    generate_context_summary returns.
+
+    Args:
+        storage: S3Storage instance
+        prefix: S3 prefix (e.g., "customer-123/orders")
+        timestamp: Specific timestamp, or None for latest
+
+    Yields:
+        Consecutive pieces of the HTML summary document
+    """
     # Get the timestamp to use
     if timestamp is None:
         timestamps = storage.list_timestamps(prefix, limit=1)
         if not timestamps:
             log.info("context.no_previous", prefix=prefix)
-            return _generate_empty_context_html(prefix)
+            yield _generate_empty_context_html(prefix)
+            return
         timestamp = timestamps[0]
 
     log.info("context.generate", prefix=prefix, timestamp=timestamp)
+    yield _context_header_html(prefix, timestamp)
 
-    # Fetch all components
-    catalog_html = _fetch_optional(storage.read_html, prefix, timestamp, "catalog.html")
-    summary_html = _fetch_optional(
-        storage.read_html, prefix, timestamp, "recent_summary.html"
-    )
-    catalog_script = _fetch_optional(
-        storage.read_script, prefix, timestamp, "catalog_script.py"
-    )
-    summary_script = _fetch_optional(
-        storage.read_script, prefix, timestamp, "summary_script.py"
-    )
+    # Start every read at once, comments first to match the document order.
+    # Each section is yielded as soon as the files it needs have arrived.
     comments = storage.list_comments(prefix, timestamp)
+    contents = storage.iter_many(
+        prefix,
+        timestamp,
+        [*(f"comments/{c['filename']}" for c in comments), *CONTEXT_FILES],
+    )
 
-    # Read all comment contents
+    # Collect comment contents
     comment_contents = []
-    for comment_info in comments:
-        content = storage.read_comment(prefix, timestamp, comment_info["filename"])
+    for comment_info, (_, content) in zip(comments, contents):
         if content:
             comment_contents.append(
                 {
@@ -96,29 +116,27 @@ def generate_context_summary(
                     "content": content,
                 }
             )
+    yield from _with_newlines(_comments_section(comment_contents))
 
-    # Generate HTML summary
-    html = _build_context_html(
-        prefix=prefix,
-        timestamp=timestamp,
-        catalog_html=catalog_html,
-        summary_html=summary_html,
-        catalog_script=catalog_script,
-        summary_script=summary_script,
-        comments=comment_contents,
-    )
+    # The remaining files arrive in CONTEXT_FILES order
+    catalog_html = next(contents)[1]
+    yield from _with_newlines(_html_section("Previous Catalog Results", catalog_html))
 
-    log.info("context.generated", prefix=prefix, timestamp=timestamp, size=len(html))
-    return html
+    summary_html = next(contents)[1]
+    yield from _with_newlines(_html_section("Previous Summary Analysis", summary_html))
 
+    catalog_script = next(contents)[1]
+    summary_script = next(contents)[1]
+    yield from _with_newlines(_scripts_section(catalog_script, summary_script))
+
+    # Footer
+    yield "\n</body>"
+    yield "\n</html>"
 
-def _fetch_optional(func, *args):
-    """Fetch content, returning None if not found."""
-    try:
-        return func(*args)
-    except Exception as e:
-        log.debug("context.fetch_optional.error", error=str(e))
-        return None
+
+def _with_newlines(pieces: list[str]) -> Iterator[str]:
+    for piece in pieces:
+        yield "\n" + piece
 
 
 def _generate_empty_context_html(prefix: str) -> str:
@@ -140,22 +158,9 @@ def _generate_empty_context_html(prefix: str) -> str:
 </html>"""
 
 
-def _build_context_html(
-    prefix: str,
-    timestamp: str,
-    catalog_html: str | None,
-    summary_html: str | None,
-    catalog_script: str | None,
-    summary_script: str | None,
-    comments: list[dict],
-) -> str:
-    """Build the complete context summary HTML."""
-
-    # Build sections
-    sections = []
-
-    # Header
-    sections.append(f"""<!DOCTYPE html>
+def _context_header_html(prefix: str, timestamp: str) -> str:
+    """Build the head and title of the context summary HTML."""
+    return f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
@@ -204,14 +209,15 @@ def _build_context_html(
 <body>
     <h1>Context Summary: {prefix}</h1>
     <p class="timestamp">Previous catalog from: <strong>{timestamp}</strong></p>
-""")
+"""
 
-    # User Comments Section (first, as they're most important for context)
+
+def _comments_section(comments: list[dict]) -> list[str]:
+    """Build the user comments section (first, as it's most important for context)."""
+    pieces = ['<div class="section">', "<h2>User Comments & Feedback</h2>"]
     if comments:
-        sections.append('<div class="section">')
-        sections.append("<h2>User Comments & Feedback</h2>")
         for comment in comments:
-            sections.append(f"""
+            pieces.append(f"""
 <div class="comment">
     <div class="comment-meta">
         <span class="comment-user">{comment["user"]}</span>
@@ -220,51 +226,39 @@ def _build_context_html(
     <div class="comment-content">{_escape_html(comment["content"])}</div>
 </div>
 """)
-        sections.append("</div>")
     else:
-        sections.append('<div class="section">')
-        sections.append("<h2>User Comments & Feedback</h2>")
-        sections.append('<p class="empty">No comments on previous catalog.</p>')
-        sections.append("</div>")
-
-    # Catalog Results
-    if catalog_html:
-        sections.append('<div class="section">')
-        sections.append("<h2>Previous Catalog Results</h2>")
-        sections.append('<div class="catalog-content">')
-        sections.append(catalog_html)
-        sections.append("</div>")
-        sections.append("</div>")
-
-    # Summary Analysis
-    if summary_html:
-        sections.append('<div class="section">')
-        sections.append("<h2>Previous Summary Analysis</h2>")
-        sections.append('<div class="catalog-content">')
-        sections.append(summary_html)
-        sections.append("</div>")
-        sections.append("</div>")
-
-    # Python Scripts
-    if catalog_script or summary_script:
-        sections.append('<div class="section">')
-        sections.append("<h2>Python Scripts</h2>")
-
-        if catalog_script:
-            sections.append("<h3>Catalog Script</h3>")
-            sections.append(f"<pre>{_escape_html(catalog_script)}</pre>")
-
-        if summary_script:
-            sections.append("<h3>Summary Script</h3>")
-            sections.append(f"<pre>{_escape_html(summary_script)}</pre>")
-
-        sections.append("</div>")
-
-    # Footer
-    sections.append("</body>")
-    sections.append("</html>")
-
-    return "\n".join(sections)
+        pieces.append('<p class="empty">No comments on previous catalog.</p>')
+    pieces.append("</div>")
+    return pieces
+
+
+def _html_section(title: str, html: str | None) -> list[str]:
+    """Build a section embedding a previous run's HTML output, if it exists."""
+    if not html:
+        return []
+    return [
+        '<div class="section">',
+        f"<h2>{title}</h2>",
+        '<div class="catalog-content">',
+        html,
+        "</div>",
+        "</div>",
+    ]
+
+
+def _scripts_section(catalog_script: str | None, summary_script: str | None) -> list[str]:
+    """Build the section listing the Python scripts a previous run executed."""
+    if not (catalog_script or summary_script):
+        return []
+    pieces = ['<div class="section">', "<h2>Python Scripts</h2>"]
+    if catalog_script:
+        pieces.append("<h3>Catalog Script</h3>")
+        pieces.append(f"<pre>{_escape_html(catalog_script)}</pre>")
+    if summary_script:
+        pieces.append("<h3>Summary Script</h3>")
+        pieces.append(f"<pre>{_escape_html(summary_script)}</pre>")
+    pieces.append("</div>")
+    return pieces
 
 
 def _escape_html(text: str) -> str:
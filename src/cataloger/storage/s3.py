@@ -1,14 +1,22 @@
 """S3 client wrapper for HTML storage."""
 
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 
 import boto3
 import structlog
+from botocore.config import Config
+from botocore.response import StreamingBody
 
 log = structlog.get_logger()
 
+# Upper bound on concurrent GetObject calls issued by iter_many/read_many
+READ_MANY_WORKERS = 16
+
 
 class S3Storage:
     """Handles reading and writing HTML catalogs to S3.
@@ -23,6 +31,8 @@ class S3Storage:
         access_key_id: str | None = None,
         secret_access_key: str | None = None,
         endpoint_url: str | None = None,
+        max_pool_connections: int = 50,
+        timestamps_ttl: float = 5.0,
     ):
         """Initialize S3 storage.
 
@@ -32,6 +42,10 @@ class S3Storage:
             access_key_id: AWS access key (defaults to environment)
             secret_access_key: AWS secret key (defaults to environment)
             endpoint_url: Custom S3 endpoint (e.g., for MinIO: http://localhost:9000)
+            max_pool_connections: HTTP connections kept open to S3; the client is
+                shared across threads, so this bounds concurrent requests
+            timestamps_ttl: Seconds to reuse a prefix's timestamp listing (0 disables).
+                Writes through this instance invalidate it immediately.
         """
         self.bucket = bucket
         self.region = region
@@ -55,7 +69,23 @@ class S3Storage:
         if endpoint_url:
             session_kwargs["endpoint_url"] = endpoint_url
 
-        self.s3 = boto3.client("s3", **session_kwargs)
+        self.s3 = boto3.client(
+            "s3", config=Config(max_pool_connections=max_pool_connections), **session_kwargs
+        )
+
+        # Newest-first timestamps per prefix, with the time they were listed
+        self.timestamps_ttl = timestamps_ttl
+        self._timestamps: dict[str, tuple[float, list[str]]] = {}
+        self._timestamps_lock = threading.Lock()
+
+    def head_bucket(self) -> None:
+        """Check that the bucket is reachable.
+
+        Also opens a pooled connection and resolves credentials, so the first
+        real request doesn't pay for them.
+        """
+        self.s3.head_bucket(Bucket=self.bucket)
+        log.info("storage.head_bucket", bucket=self.bucket)
 
     def write_html(
         self, prefix: str, timestamp: str, filename: str, content: str
@@ -79,6 +109,7 @@ class S3Storage:
             Body=content.encode("utf-8"),
             ContentType="text/html",
         )
+        self._invalidate_timestamps(prefix)
 
         uri = f"s3://{self.bucket}/{key}"
         log.info("storage.write", uri=uri, size=len(content))
@@ -103,6 +134,74 @@ class S3Storage:
         log.info("storage.read", key=key, size=len(content))
         return content
 
+    def open_html(self, prefix: str, timestamp: str, filename: str) -> StreamingBody:
+        """Open HTML content in S3 for streaming.
+
+        Args:
+            prefix: S3 prefix
+            timestamp: ISO timestamp
+            filename: HTML filename
+
+        Returns:
+            Streaming body of the object; the caller must close it
+        """
+        key = f"{prefix}/{timestamp}/{filename}"
+
+        response = self.s3.get_object(Bucket=self.bucket, Key=key)
+
+        log.info("storage.open", key=key, size=response.get("ContentLength"))
+        return response["Body"]
+
+    def iter_many(
+        self, prefix: str, timestamp: str, filenames: list[str]
+    ) -> Iterator[tuple[str, str | None]]:
+        """Read several text objects under one timestamp concurrently, in order.
+
+        All reads start at once; each (filename, content) pair is yielded as soon
+        as it and every file before it have been read, so callers can use the
+        first files without waiting for the slowest one.
+
+        Args:
+            prefix: S3 prefix
+            timestamp: ISO timestamp
+            filenames: Filenames relative to the timestamp (e.g., "comments/a.txt")
+
+        Yields:
+            (filename, content) pairs in the order given; content is None if the
+            object couldn't be read
+        """
+        if not filenames:
+            return
+
+        def read(filename: str) -> str | None:
+            key = f"{prefix}/{timestamp}/{filename}"
+            try:
+                response = self.s3.get_object(Bucket=self.bucket, Key=key)
+                return response["Body"].read().decode("utf-8")
+            except Exception as e:
+                log.debug("storage.read_many.error", key=key, error=str(e))
+                return None
+
+        log.info("storage.read_many", prefix=prefix, timestamp=timestamp, count=len(filenames))
+        workers = min(len(filenames), READ_MANY_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from zip(filenames, executor.map(read, filenames))
+
+    def read_many(
+        self, prefix: str, timestamp: str, filenames: list[str]
+    ) -> dict[str, str | None]:
+        """Read several text objects under one timestamp concurrently.
+
+        Args:
+            prefix: S3 prefix
+            timestamp: ISO timestamp
+            filenames: Filenames relative to the timestamp (e.g., "comments/a.txt")
+
+        Returns:
+            Dict mapping each filename to its content, or None if it couldn't be read
+        """
+        return dict(self.iter_many(prefix, timestamp, filenames))
+
     def write_script(
         self, prefix: str, timestamp: str, filename: str, content: str
     ) -> str:
@@ -125,6 +224,7 @@ class S3Storage:
             Body=content.encode("utf-8"),
             ContentType="text/x-python",
         )
+        self._invalidate_timestamps(prefix)
 
         uri = f"s3://{self.bucket}/{key}"
         log.info("storage.write_script", uri=uri, size=len(content))
@@ -224,24 +324,34 @@ class S3Storage:
         Returns:
             List of ISO timestamps, sorted newest to oldest
         """
+        with self._timestamps_lock:
+            entry = self._timestamps.get(prefix)
+        if entry is not None and time.monotonic() - entry[0] < self.timestamps_ttl:
+            return entry[1][:limit]
+
         # List objects under prefix
+        key_prefix = f"{prefix}/"
+        listed_at = time.monotonic()
         response = self.s3.list_objects_v2(
-            Bucket=self.bucket, Prefix=f"{prefix}/", Delimiter="/"
+            Bucket=self.bucket, Prefix=key_prefix, Delimiter="/"
         )
 
-        # Extract timestamps from CommonPrefixes
-        timestamps = []
-        for item in response.get("CommonPrefixes", []):
-            # item["Prefix"] looks like "prefix/2024-01-15T10:00:00Z/"
-            parts = item["Prefix"].rstrip("/").split("/")
-            if len(parts) >= 2:
-                timestamp = parts[-1]
-                timestamps.append(timestamp)
+        # Extract timestamps from CommonPrefixes, which look like
+        # "prefix/2024-01-15T10:00:00Z/"
+        start = len(key_prefix)
+        timestamps = [item["Prefix"][start:-1] for item in response.get("CommonPrefixes", [])]
 
-        # Sort newest first
+        # Sort newest first (ISO timestamps sort lexicographically)
         timestamps.sort(reverse=True)
+        if self.timestamps_ttl > 0:
+            with self._timestamps_lock:
+                self._timestamps[prefix] = (listed_at, timestamps)
         return timestamps[:limit]
 
+    def _invalidate_timestamps(self, prefix: str) -> None:
+        with self._timestamps_lock:
+            self._timestamps.pop(prefix, None)
+
     def list_catalogs(
         self, prefix: str, timestamp: str
     ) -> list[dict[str, str]]:
@@ -0,0 +1,27 @@
+"""Tests for the agent loop's history compaction."""
+
+from cataloger.agent.loop import AgentLoop
+
+
+def test_compact_history_elides_old_long_results():
+    """Test that long tool results are elided except in the newest messages."""
+    agent = AgentLoop(client=None, runtime=None)
+
+    def results(content):
+        return {
+            "role": "user",
+            "content": [{"type": "tool_result", "tool_use_id": "t", "content": content}],
+        }
+
+    long_output = "x" * 5000
+    messages = [{"role": "user", "content": "context"}]
+    for _ in range(3):
+        messages += [{"role": "assistant", "content": []}, results(long_output)]
+    messages.append(results("short"))
+
+    agent._compact_history(messages)
+
+    assert messages[2]["content"][0]["content"].startswith("[elided: 5000 chars")
+    assert messages[4]["content"][0]["content"] == long_output
+    assert messages[6]["content"][0]["content"] == long_output
+    assert messages[7]["content"][0]["content"] == "short"
@@ -0,0 +1,65 @@
+"""Tests for context summary helpers."""
+
+from cataloger.context import generate_context_summary, iter_context_summary, strip_html_tags
+
+
+class FakeStorage:
+    """In-memory stand-in for S3Storage with a single previous run."""
+
+    def __init__(self):
+        self.reads = 0
+
+    def list_timestamps(self, prefix, limit=100):
+        return ["2024-01-15T10:00:00Z"]
+
+    def list_comments(self, prefix, timestamp):
+        self.reads += 1
+        return [{"filename": "alice-2024-01-16T09:00:00Z.txt", "user": "alice", "date": "x"}]
+
+    def iter_many(self, prefix, timestamp, filenames):
+        objects = {
+            "catalog.html": "<p>orders catalog</p>",
+            "comments/alice-2024-01-16T09:00:00Z.txt": "check nulls",
+        }
+        for filename in filenames:
+            self.reads += 1
+            yield filename, objects.get(filename)
+
+
+def test_strip_html_tags():
+    """Test that tags are removed and text is kept."""
+    html = '<html><body><h1 class="title">Orders</h1><p>Rows: <b>42</b></p></body></html>'
+    assert strip_html_tags(html) == "OrdersRows: 42"
+
+
+def test_strip_html_tags_comments_and_entities():
+    """Test that comments are dropped and character references decoded."""
+    html = "<!DOCTYPE html><!-- a > b --><p>price &lt; 10 &amp; qty &gt; 0</p>"
+    assert strip_html_tags(html) == "price < 10 & qty > 0"
+
+
+def test_iter_context_summary_streams_header_first():
+    """Test that the header is yielded before S3 is read and pieces join to the summary."""
+    storage = FakeStorage()
+    pieces = iter_context_summary(storage, "customer-123/orders")
+
+    header = next(pieces)
+    assert "Context Summary: customer-123/orders" in header
+    assert storage.reads == 0
+
+    document = header + "".join(pieces)
+    assert "<p>orders catalog</p>" in document
+    assert "check nulls" in document
+    assert document == generate_context_summary(FakeStorage(), "customer-123/orders")
+
+
+def test_iter_context_summary_yields_sections_as_files_arrive():
+    """Test that the comments section is yielded before the catalog is read."""
+    storage = FakeStorage()
+    pieces = iter_context_summary(storage, "customer-123/orders")
+
+    next(pieces)  # header
+    while "check nulls" not in next(pieces):
+        pass
+    # list_comments plus the one comment file; catalog.html not read yet
+    assert storage.reads == 2
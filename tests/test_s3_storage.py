@@ -1,5 +1,8 @@
 """Tests for S3 storage."""
 
+import io
+from unittest.mock import patch
+
 import pytest
 
 from cataloger.storage.s3 import S3Storage, generate_timestamp
@@ -20,9 +23,60 @@ def test_s3_storage_initialization():
     assert storage.region == "us-west-2"
 
 
+def test_s3_storage_connection_pool():
+    """Test that the shared client's connection pool size is configurable."""
+    storage = S3Storage(bucket="test-bucket", max_pool_connections=25)
+    assert storage.s3.meta.config.max_pool_connections == 25
+
+
 def test_s3_config():
     """Test S3 config generation."""
     storage = S3Storage(bucket="test-bucket")
     config = storage.get_config()
     assert config["bucket"] == "test-bucket"
     assert "region" in config
+
+
+def test_read_many():
+    """Test that read_many returns every object and None for missing ones."""
+    storage = S3Storage(bucket="test-bucket")
+    objects = {"p/ts/catalog.html": b"<p>catalog</p>", "p/ts/comments/a.txt": b"hi"}
+
+    def get_object(Bucket, Key):
+        if Key not in objects:
+            raise storage.s3.exceptions.NoSuchKey({}, "GetObject")
+        return {"Body": io.BytesIO(objects[Key])}
+
+    with patch.object(storage.s3, "get_object", side_effect=get_object):
+        contents = storage.read_many(
+            "p", "ts", ["catalog.html", "comments/a.txt", "summary_script.py"]
+        )
+
+    assert contents == {
+        "catalog.html": "<p>catalog</p>",
+        "comments/a.txt": "hi",
+        "summary_script.py": None,
+    }
+
+
+def test_list_timestamps_cached_until_write():
+    """Test that timestamp listings are reused until a write to the prefix."""
+    storage = S3Storage(bucket="test-bucket")
+    listing = {
+        "CommonPrefixes": [
+            {"Prefix": "c/db/2024-01-15T10:00:00Z/"},
+            {"Prefix": "c/db/2024-02-01T08:30:00Z/"},
+        ]
+    }
+
+    with (
+        patch.object(storage.s3, "list_objects_v2", return_value=listing) as list_objects,
+        patch.object(storage.s3, "put_object"),
+    ):
+        assert storage.list_timestamps("c/db") == ["2024-02-01T08:30:00Z", "2024-01-15T10:00:00Z"]
+        assert storage.list_timestamps("c/db", limit=1) == ["2024-02-01T08:30:00Z"]
+        assert list_objects.call_count == 1
+
+        storage.write_html("c/db", "2024-03-01T00:00:00Z", "catalog.html", "<p></p>")
+        storage.list_timestamps("c/db")
+        assert list_objects.call_count == 2